@@ -6,7 +6,8 @@
 # This is slow (~30 seconds) - only run when looking for new content.
 #
 # Usage:
-#   ./discover.sh
+#   ./discover.sh            # Sequential crawl
+#   ./discover.sh --async    # Concurrent crawl with a token-bucket rate limit
 #
 # What it does:
 #   1. Scrapes KCUR.org for Cyprus Avenue playlists
@@ -43,7 +44,8 @@ echo ""
 # Run discovery tool with mounted volumes
 docker run --rm \
     -v "$PROJECT_ROOT:/app" \
-    cyprus-avenue-discover
+    cyprus-avenue-discover \
+    python scripts/discovery/discover_playlists.py "$@"
 
 echo ""
 echo "✨ Discovery complete!"
@@ -11,10 +11,12 @@
 #   - Set SPOTIFY_CLIENT_ID and SPOTIFY_CLIENT_SECRET environment variables
 #
 # Usage:
-#   ./index-spotify.sh [--missing-only]
+#   ./index-spotify.sh [--missing-only | --delta]
 #
 # Options:
 #   --missing-only    Only search for tracks not already in spotify-index.json
+#   --delta           Only search tracks the parser found new since the last run
+#                     (json/track_keys_delta.json, written by ./update-playlists.sh)
 #
 # What it does:
 #   1. Reads json/playlists.json
@@ -29,11 +31,14 @@ echo "🎵 Cyprus Avenue - Index Spotify Tracks"
 echo "========================================"
 echo ""
 
-# Check for --missing-only flag
+# Check for --missing-only / --delta flags
 MISSING_ONLY=false
+DELTA_ONLY=false
 for arg in "$@"; do
     if [ "$arg" == "--missing-only" ]; then
         MISSING_ONLY=true
+    elif [ "$arg" == "--delta" ]; then
+        DELTA_ONLY=true
     fi
 done
 
@@ -64,7 +69,9 @@ fi
 # Get absolute path to project root
 PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
-if [ "$MISSING_ONLY" = true ]; then
+if [ "$DELTA_ONLY" = true ]; then
+    echo "⏱️  Mode: New tracks only (json/track_keys_delta.json). Usually takes seconds."
+elif [ "$MISSING_ONLY" = true ]; then
     echo "⏱️  Mode: Missing tracks only. This will be much faster if most tracks are indexed."
 else
     echo "⏱️  This will take 7-10 minutes for ~1,449 tracks"
@@ -4,42 +4,56 @@ Web scraper to discover all Cyprus Avenue playlists on KCUR website.
 Identifies available playlists and compares against existing archive.
 """
 
-import requests
-from bs4 import BeautifulSoup
+import argparse
+import asyncio
 import json
 import re
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import urljoin
+import sys
 import time
 
+import html_extract
+import http_client
+from feed_discovery import discover_from_sources
+from rate_limit import TokenBucket
 
-def fetch_page_playlists(url):
+# The archive date index is shared with the parsing pipeline
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'parsing'))
+from archive_index import refresh_archive_index
+from json_io import write_json_atomic
+
+
+BASE_URL = "https://www.kcur.org/tags/cyprus-avenue"
+
+# Pagination scheme that works and newest date seen, saved between runs
+CRAWL_STATE_PATH = 'data/crawl_state.json'
+
+
+def fetch_page_playlists(page_url):
     """Fetch playlists from a single page"""
     discovered = []
 
-    response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
+    response = http_client.get(page_url, headers={'User-Agent': 'Mozilla/5.0'})
     if response.status_code != 200:
-        print(f"  Error fetching {url} (status {response.status_code})")
+        print(f"  Error fetching {page_url} (status {response.status_code})")
         return discovered
 
-    soup = BeautifulSoup(response.content, 'html.parser')
-
     # Find all links with dates in URL
-    all_links = soup.find_all('a', href=True)
-    article_links = [l for l in all_links if re.search(r'/\d{4}-\d{2}-\d{2}/', l.get('href', ''))]
+    article_links = [(href, text) for href, text in html_extract.listing_links(response.content)
+                     if re.search(r'/\d{4}-\d{2}-\d{2}/', href)]
 
     # Deduplicate by URL
     seen_urls = set()
-    for link in article_links:
-        url = link.get('href')
+    for url, title in article_links:
         if not url.startswith('http'):
-            url = 'https://www.kcur.org' + url
+            url = urljoin(page_url, url)
 
         if url in seen_urls:
             continue
         seen_urls.add(url)
 
-        title = link.get_text(strip=True)
         if not title:
             title = url.split('/')[-1].replace('-', ' ').title()
 
@@ -56,12 +70,14 @@ def fetch_page_playlists(url):
     return discovered
 
 
-def fetch_kcur_playlists():
+def fetch_kcur_playlists(base_url=BASE_URL, strategy_counts=None):
     """
     Fetch all Cyprus Avenue content from KCUR website.
     Try multiple strategies to get all content including pagination.
+    If strategy_counts is given, it is filled with the number of new
+    items each strategy ('main', 'page', 'offset') contributed.
     """
-    base_url = "https://www.kcur.org/tags/cyprus-avenue"
+    counts = {'main': 0, 'page': 0, 'offset': 0}
 
     print("Fetching Cyprus Avenue content from KCUR...")
     print("Trying multiple pagination strategies...")
@@ -77,6 +93,7 @@ def fetch_kcur_playlists():
         if item['url'] not in seen_urls:
             all_discovered.append(item)
             seen_urls.add(item['url'])
+            counts['main'] += 1
 
     # Strategy 2: Try common pagination patterns (page parameter)
     print(f"\n[2/3] Trying page number pagination...")
@@ -95,6 +112,7 @@ def fetch_kcur_playlists():
                 new_items += 1
 
         print(f"  Page {page_num}: {new_items} new items")
+        counts['page'] += new_items
         if new_items == 0:
             print(f"  No new items, stopping pagination")
             break
@@ -124,6 +142,7 @@ def fetch_kcur_playlists():
 
         if new_items > 0:
             print(f"  Offset {offset}: {new_items} new items")
+        counts['offset'] += new_items
 
         if new_items == 0:
             break
@@ -133,9 +152,170 @@ def fetch_kcur_playlists():
         time.sleep(0.5)
 
     print(f"\n✓ Total unique items discovered: {len(all_discovered)}")
+    if strategy_counts is not None:
+        strategy_counts.update(counts)
     return all_discovered
 
 
+def add_new_items(page_items, all_discovered, seen_urls):
+    """Append items whose URL hasn't been seen yet, returning how many were new"""
+    new_items = 0
+    for item in page_items:
+        if item['url'] not in seen_urls:
+            all_discovered.append(item)
+            seen_urls.add(item['url'])
+            new_items += 1
+    return new_items
+
+
+async def crawl_pages(urls, fetch, all_discovered, seen_urls, concurrency, label):
+    """
+    Fetch paginated URLs `concurrency` at a time, consuming results in page order.
+    Stops at the first page with no items or no new items, exactly like the
+    sequential crawl; pages fetched speculatively past that point are discarded.
+    Returns the number of new items found.
+    """
+    total_new = 0
+    for start in range(0, len(urls), concurrency):
+        window = urls[start:start + concurrency]
+        results = await asyncio.gather(*(fetch(url) for url in window))
+
+        for offset, page_items in enumerate(results):
+            page = label(start + offset)
+            if not page_items:
+                print(f"  No results on {page}, stopping pagination")
+                return total_new
+
+            new_items = add_new_items(page_items, all_discovered, seen_urls)
+            total_new += new_items
+            print(f"  {page.capitalize()}: {new_items} new items")
+            if new_items == 0:
+                print(f"  No new items, stopping pagination")
+                return total_new
+    return total_new
+
+
+async def fetch_kcur_playlists_async(base_url=BASE_URL, concurrency=4, rate=2.0, strategy_counts=None):
+    """
+    Concurrent version of fetch_kcur_playlists().
+    Pages are fetched up to `concurrency` at a time, and a token bucket
+    limits requests to `rate` per second instead of fixed sleeps.
+    """
+    counts = {'main': 0, 'page': 0, 'offset': 0}
+    limiter = TokenBucket(rate, capacity=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(url):
+        async with semaphore:
+            await limiter.wait_async()
+            return await asyncio.to_thread(fetch_page_playlists, url)
+
+    print("Fetching Cyprus Avenue content from KCUR...")
+    print(f"Crawling concurrently ({concurrency} at a time, {rate} requests/sec)...")
+
+    all_discovered = []
+    seen_urls = set()
+
+    # Strategy 1: Try the main tag page
+    print(f"\n[1/3] Fetching main tag page...")
+    page_items = await fetch(base_url)
+    print(f"  Found {len(page_items)} items")
+    counts['main'] = add_new_items(page_items, all_discovered, seen_urls)
+
+    # Strategy 2: Try common pagination patterns (page parameter)
+    print(f"\n[2/3] Trying page number pagination...")
+    page_urls = [f"{base_url}?page={page_num}" for page_num in range(1, 20)]
+    counts['page'] = await crawl_pages(page_urls, fetch, all_discovered, seen_urls, concurrency,
+                      label=lambda i: f"page {i + 1}")
+
+    # Strategy 3: Try offset-based pagination
+    print(f"\n[3/3] Trying offset-based pagination...")
+    limit = 10
+    offset_urls = [f"{base_url}?offset={i * limit}&limit={limit}" for i in range(50)]
+    counts['offset'] = await crawl_pages(offset_urls, fetch, all_discovered, seen_urls, concurrency,
+                      label=lambda i: f"offset {i * limit}")
+
+    print(f"\n✓ Total unique items discovered: {len(all_discovered)}")
+    if strategy_counts is not None:
+        strategy_counts.update(counts)
+    return all_discovered
+
+
+def detect_pagination(strategy_counts):
+    """The pagination scheme that found items beyond the main page, if any"""
+    for scheme in ('page', 'offset'):
+        if strategy_counts.get(scheme):
+            return scheme
+    return None
+
+
+def pagination_urls(base_url, scheme):
+    """Listing URLs after the main page for a pagination scheme"""
+    if scheme == 'page':
+        return [f"{base_url}?page={page_num}" for page_num in range(1, 20)]
+    if scheme == 'offset':
+        return [f"{base_url}?offset={i * 10}&limit=10" for i in range(50)]
+    return []
+
+
+def load_crawl_state(state_path=CRAWL_STATE_PATH):
+    """Saved crawler state: working pagination scheme and newest date seen"""
+    try:
+        with open(state_path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_crawl_state(state, state_path=CRAWL_STATE_PATH):
+    """Atomically write the crawler state"""
+    write_json_atomic(state, state_path)
+
+
+def fetch_new_playlists(base_url, state, rate=2.0):
+    """
+    Incremental crawl: walk the listing newest-first with the pagination scheme
+    saved in `state`, stopping at the first page that goes past the saved
+    watermark date. Returns items dated on or after the watermark, so a
+    second show on the watermark date isn't missed; merge_discovered()
+    drops the ones already known.
+    """
+    watermark = state['newest_date']
+    scheme = state.get('pagination')
+    limiter = TokenBucket(rate)
+
+    print("Fetching new Cyprus Avenue content from KCUR...")
+    print(f"Stopping at shows before {watermark} (pagination: {scheme or 'main page only'})")
+
+    all_discovered = []
+    seen_urls = set()
+
+    for url in [base_url] + pagination_urls(base_url, scheme):
+        limiter.wait()
+        page_items = fetch_page_playlists(url)
+        if not page_items:
+            break
+
+        newer = [item for item in page_items if not item['date'] or item['date'] >= watermark]
+        new_items = add_new_items(newer, all_discovered, seen_urls)
+        print(f"  {url}: {new_items} new items")
+
+        if len(newer) < len(page_items):
+            print(f"  Reached already-seen dates, stopping")
+            break
+        if new_items == 0:
+            break
+
+    print(f"\n✓ New items discovered: {len(all_discovered)}")
+    return all_discovered
+
+
+def merge_discovered(new_items, existing):
+    """New items first, followed by previously discovered items not re-found"""
+    seen_urls = {item['url'] for item in new_items}
+    return new_items + [item for item in existing if item['url'] not in seen_urls]
+
+
 def analyze_gaps(discovered_playlists, archive_dir='json/individual'):
     """
     Compare discovered playlists against existing archive.
@@ -146,15 +326,8 @@ def analyze_gaps(discovered_playlists, archive_dir='json/individual'):
         print(f"Warning: Archive directory {archive_dir} not found")
         return
 
-    archived_dates = set()
-    archived_playlists = []
-
-    for json_file in archive_path.glob('*.json'):
-        with open(json_file, 'r') as f:
-            data = json.load(f)
-            if data.get('date'):
-                archived_dates.add(data['date'])
-                archived_playlists.append(data)
+    # Dates come from the archive index, which only re-reads changed files
+    archived_dates = set(refresh_archive_index(archive_dir))
 
     print(f"\n{'='*70}")
     print(f"Archive Analysis")
@@ -208,11 +381,67 @@ def analyze_gaps(discovered_playlists, archive_dir='json/individual'):
 
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description='Discover Cyprus Avenue playlists on the KCUR website')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='Crawl pages concurrently instead of one at a time')
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help='Maximum pages in flight with --async (default: 4)')
+    parser.add_argument('--rate', type=float, default=2.0,
+                        help='Maximum requests per second for --async and incremental crawls (default: 2)')
+    parser.add_argument('--base-url', default=BASE_URL, help=f'Tag page to crawl (default: {BASE_URL})')
+    parser.add_argument('--full', action='store_true',
+                        help='Run every pagination strategy instead of stopping at already-seen dates')
+    parser.add_argument('--sitemap', action='append', default=[], metavar='URL_OR_FILE',
+                        help='Discover from a sitemap or sitemap index instead of tag pages (repeatable)')
+    parser.add_argument('--feed', action='append', default=[], metavar='URL_OR_FILE',
+                        help='Discover from an RSS/Atom feed instead of tag pages (repeatable)')
+    parser.add_argument('--url-pattern',
+                        help='Regex sitemap/feed URLs must match, on top of the date-in-URL check '
+                             '(e.g. "/(music-shows|arts-life)/")')
+    parser.add_argument('--keyword', action='append', default=[],
+                        help='Keep sitemap/feed entries whose title or URL contains this text, ignoring case '
+                             '(repeatable; e.g. "cyprus avenue"). --sitemap needs this or --url-pattern')
+    parser.add_argument('--since', metavar='YYYY-MM-DD',
+                        help='Skip sitemap/feed entries last modified before this date')
+    http_client.add_arguments(parser)
+    html_extract.add_arguments(parser)
+    args = parser.parse_args()
+    if args.sitemap and not (args.url_pattern or args.keyword):
+        # Sitemaps list every dated page on the site, not just Cyprus Avenue shows
+        parser.error('--sitemap needs --url-pattern or --keyword to scope it to Cyprus Avenue shows')
+    http_client.configure_from_args(args, pool_size=max(10, args.concurrency))
+    html_extract.configure_from_args(args)
+
     print("Cyprus Avenue Playlist Discovery Tool")
     print("=" * 70)
 
-    # Discover playlists on KCUR
-    discovered = fetch_kcur_playlists()
+    state = load_crawl_state()
+    previous = []
+    if Path('data/discovered_playlists.json').exists():
+        with open('data/discovered_playlists.json', 'r') as f:
+            previous = json.load(f)
+
+    # Discover playlists on KCUR. Only tag-page crawls move the watermark: sitemaps
+    # and feeds can list dated pages the tag pages never reach
+    crawled = None
+    if args.sitemap or args.feed:
+        # Structured index: a few requests instead of paging through HTML
+        print("Reading Cyprus Avenue entries from sitemaps/feeds...")
+        found = discover_from_sources(args.sitemap + args.feed, args.url_pattern, args.since, args.keyword)
+        discovered = merge_discovered(found, previous)
+    elif state.get('newest_date') and previous and not args.full:
+        # Routine run: only walk back to the newest date seen last time
+        crawled = fetch_new_playlists(args.base_url, state, args.rate)
+        discovered = merge_discovered(crawled, previous)
+    else:
+        strategy_counts = {}
+        if args.use_async:
+            discovered = asyncio.run(fetch_kcur_playlists_async(args.base_url, max(1, args.concurrency), args.rate,
+                                                                strategy_counts=strategy_counts))
+        else:
+            discovered = fetch_kcur_playlists(args.base_url, strategy_counts=strategy_counts)
+        state['pagination'] = detect_pagination(strategy_counts)
+        crawled = discovered
 
     if not discovered:
         print("No playlists discovered. Check your internet connection or the site may have changed.")
@@ -224,6 +453,12 @@ def main():
 
     print(f"✓ Saved discovered playlists to data/discovered_playlists.json")
 
+    # Remember the newest date the tag pages reached, so the next run can stop there
+    dates = [item['date'] for item in crawled or [] if item['date']]
+    if dates:
+        state['newest_date'] = max(dates + ([state['newest_date']] if state.get('newest_date') else []))
+    save_crawl_state(state)
+
     # Analyze gaps
     results = analyze_gaps(discovered)
 
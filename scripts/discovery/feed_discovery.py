@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Sitemap and RSS/Atom feed discovery for Cyprus Avenue playlists.
+
+Reads structured indexes instead of paging through tag-page HTML.
+Documents are parsed with a streaming XML parser, entries are filtered by
+URL pattern, title/URL keywords and lastmod, and the result is the same
+{'title', 'date', 'url'} records that analyze_gaps() consumes.
+Sources can be URLs or local files (plain or gzipped).
+"""
+
+import gzip
+import io
+import re
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+
+import http_client
+
+
+DATE_IN_URL_RE = re.compile(r'/(\d{4})-(\d{2})-(\d{2})/')
+
+
+def read_source(source):
+    """Bytes of a sitemap/feed URL or local file, gunzipped if needed"""
+    if source.startswith(('http://', 'https://')):
+        response = http_client.get(source, headers={'User-Agent': 'Mozilla/5.0'})
+        response.raise_for_status()
+        data = response.content
+    else:
+        with open(source, 'rb') as f:
+            data = f.read()
+
+    if data[:2] == b'\x1f\x8b':
+        data = gzip.decompress(data)
+    return data
+
+
+def local_name(tag):
+    """Tag name without its XML namespace"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def child_text(elem, name):
+    """Text of the first direct child with this local name, or None"""
+    for child in elem:
+        if local_name(child.tag) == name:
+            return (child.text or '').strip()
+    return None
+
+
+def entry_date(value):
+    """YYYY-MM-DD from an ISO 8601 or RFC 822 timestamp, or None"""
+    if not value:
+        return None
+    if re.match(r'\d{4}-\d{2}-\d{2}', value):
+        return value[:10]
+    try:
+        return parsedate_to_datetime(value).strftime('%Y-%m-%d')
+    except (TypeError, ValueError):
+        return None
+
+
+def matches_keywords(url, title, keywords):
+    """Whether any keyword appears in the entry's title or URL slug, ignoring case"""
+    text = f"{title or ''} {url.replace('-', ' ')}".lower()
+    return any(keyword.lower() in text for keyword in keywords)
+
+
+def iter_entries(data):
+    """
+    Stream (kind, url, title, lastmod) tuples from a sitemap, sitemap
+    index, RSS or Atom document. kind is 'sitemap' for sitemap index
+    children and 'page' for everything else.
+    """
+    for _, elem in ET.iterparse(io.BytesIO(data), events=('end',)):
+        name = local_name(elem.tag)
+
+        if name == 'sitemap':
+            yield 'sitemap', child_text(elem, 'loc'), None, child_text(elem, 'lastmod')
+        elif name == 'url':
+            # Google News / image sitemap extensions carry a title
+            title = None
+            for sub in elem.iter():
+                if local_name(sub.tag) == 'title' and sub.text:
+                    title = sub.text.strip()
+                    break
+            yield 'page', child_text(elem, 'loc'), title, child_text(elem, 'lastmod')
+        elif name == 'item':
+            yield 'page', child_text(elem, 'link'), child_text(elem, 'title'), child_text(elem, 'pubDate')
+        elif name == 'entry':
+            link = None
+            for sub in elem:
+                if local_name(sub.tag) == 'link' and sub.get('rel', 'alternate') == 'alternate':
+                    link = sub.get('href')
+                    break
+            yield 'page', link, child_text(elem, 'title'), child_text(elem, 'updated') or child_text(elem, 'published')
+        else:
+            continue
+
+        # Free finished entries so large documents stay flat in memory
+        elem.clear()
+
+
+def discover_from_sources(sources, url_pattern=None, since=None, keywords=None):
+    """
+    Discover playlists from sitemap/feed sources. Sitemap indexes are
+    followed into their child sitemaps. Entries must have a date in their
+    URL, match url_pattern (a regex) if given and contain one of keywords
+    in their title or URL if given; with since (YYYY-MM-DD), entries and
+    child sitemaps last modified before it are skipped.
+    """
+    pattern = re.compile(url_pattern) if url_pattern else None
+    discovered = []
+    seen_urls = set()
+    pending = list(sources)
+    visited = set()
+
+    while pending:
+        source = pending.pop(0)
+        if source in visited:
+            continue
+        visited.add(source)
+        print(f"  Reading {source}...")
+
+        try:
+            data = read_source(source)
+        except Exception as e:
+            print(f"  Error reading {source}: {e}")
+            continue
+
+        for kind, url, title, lastmod in iter_entries(data):
+            if not url:
+                continue
+            modified = entry_date(lastmod)
+            if since and modified and modified < since:
+                continue
+
+            if kind == 'sitemap':
+                pending.append(url)
+                continue
+
+            date_match = DATE_IN_URL_RE.search(url)
+            if not date_match or (pattern and not pattern.search(url)) or url in seen_urls:
+                continue
+            if keywords and not matches_keywords(url, title, keywords):
+                continue
+            seen_urls.add(url)
+
+            if not title:
+                title = url.rstrip('/').split('/')[-1].replace('-', ' ').title()
+
+            discovered.append({
+                'title': title,
+                'date': date_match.group(0)[1:-1],
+                'url': url
+            })
+
+    print(f"\n✓ Total unique items discovered: {len(discovered)}")
+    return discovered
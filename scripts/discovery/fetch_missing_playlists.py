@@ -4,13 +4,34 @@ Automated scraper to fetch missing Cyprus Avenue playlists from KCUR.
 Downloads playlist pages, extracts content, and adds to archive.
 """
 
-import requests
-from bs4 import BeautifulSoup
+import argparse
+import bisect
+import gzip
 import json
+import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-import time
+
+import html_extract
+import http_client
+from rate_limit import TokenBucket
+
+# The archive date index and artist alias table are shared with the parsing pipeline
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'parsing'))
+from archive_index import refresh_archive_index
+from artist_aliases import canonicalize_tracks
+from json_io import write_json_atomic
+from playlist_manifest import MANIFEST_PATH, bytes_digest, playlist_digest, update_manifest
+
+
+# Append-only record of fetched dates, so interrupted runs can resume
+JOURNAL_PATH = 'data/fetch_journal.jsonl'
+
+# Fetched pages, one gzipped file per date, for offline re-extraction
+HTML_ARCHIVE_DIR = 'archive/html'
 
 
 def fetch_playlist_page(url):
@@ -22,7 +43,7 @@ def fetch_playlist_page(url):
     }
 
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http_client.get(url, headers=headers)
         response.raise_for_status()
         return response.text
     except Exception as e:
@@ -32,53 +53,15 @@ def fetch_playlist_page(url):
 
 def extract_playlist_from_html(html_content, url):
     """Extract playlist information from HTML"""
-    soup = BeautifulSoup(html_content, 'html.parser')
-
-    # Extract title - usually in h1 or article title
-    title = ""
-    title_elem = soup.find('h1') or soup.find('h2', class_=re.compile('title|headline'))
-    if title_elem:
-        title = title_elem.get_text(strip=True)
+    # Title, article text and the section most likely to hold the track list
+    title, description, track_section = html_extract.show_page_sections(html_content)
 
     # Extract date from URL
     date_match = re.search(r'/(\d{4})-(\d{2})-(\d{2})/', url)
     date = date_match.group(0)[1:-1] if date_match else None
 
-    # Extract description/article content
-    description = ""
-    # Look for article body or main content
-    article_body = soup.find('div', class_=re.compile('article-body|content|description|body'))
-    if article_body:
-        # Get text but exclude certain elements
-        for script in article_body(['script', 'style', 'nav', 'header', 'footer']):
-            script.decompose()
-        description = article_body.get_text(separator=' ', strip=True)
-
-    # Extract tracks - look for various list patterns
     tracks = []
 
-    # Strategy 1: Look for track list sections
-    track_section = None
-    for header in soup.find_all(['h2', 'h3', 'h4', 'strong', 'b']):
-        header_text = header.get_text(strip=True).lower()
-        if any(marker in header_text for marker in ['track list', 'tracks', 'playlist', 'songs']):
-            # Found a track list header, get content after it
-            track_section = header.find_next_sibling()
-            break
-
-    # Strategy 2: Look for lists (ul/ol) that might contain tracks
-    if not track_section:
-        lists = soup.find_all(['ul', 'ol'])
-        for lst in lists:
-            items = lst.find_all('li')
-            if len(items) >= 3:  # At least 3 items suggests a track list
-                track_section = lst
-                break
-
-    # Strategy 3: Look for content with track-like patterns
-    if not track_section and article_body:
-        track_section = article_body
-
     # Determine likely artist from title for single-artist shows
     # Extract artist name from title (e.g., "The Beatles' 12 Greatest Hits" -> "The Beatles")
     title_artist = None
@@ -168,17 +151,16 @@ def extract_playlist_from_html(html_content, url):
         "date": date,
         "title": title,
         "description": description[:500] if description else "",  # Limit description length
-        "tracks": tracks,
+        "tracks": canonicalize_tracks(tracks),
         "source_url": url,
         "archived_date": datetime.now().strftime("%Y-%m-%d")
     }
 
 
-def save_playlist(playlist_data, output_dir='json/individual', raw_dir='archive/txt'):
-    """Save playlist as JSON and optionally save raw content"""
+def save_playlist(playlist_data, output_dir='json/individual', raw_dir=HTML_ARCHIVE_DIR, html_content=None):
+    """Save playlist as JSON and, if given, the page it came from as {raw_dir}/{date}.html.gz"""
     # Create directories
     Path(output_dir).mkdir(parents=True, exist_ok=True)
-    Path(raw_dir).mkdir(parents=True, exist_ok=True)
 
     date = playlist_data['date']
     if not date:
@@ -187,36 +169,149 @@ def save_playlist(playlist_data, output_dir='json/individual', raw_dir='archive/
 
     # Save individual JSON
     json_path = Path(output_dir) / f"{date}.json"
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(playlist_data, f, indent=2, ensure_ascii=False)
+    write_json_atomic(playlist_data, json_path)
+
+    if html_content is not None:
+        save_raw_html(html_content, date, raw_dir)
 
     print(f"  ✓ Saved {json_path} ({len(playlist_data['tracks'])} tracks)")
     return True
 
 
-def update_consolidated_json(json_dir='json/individual', output_file='json/playlists.json'):
-    """Rebuild the consolidated playlists.json file"""
-    json_path = Path(json_dir)
-    all_playlists = []
+def save_raw_html(html_content, date, raw_dir=HTML_ARCHIVE_DIR):
+    """Atomically store a fetched page as {raw_dir}/{date}.html.gz"""
+    Path(raw_dir).mkdir(parents=True, exist_ok=True)
+    html_path = Path(raw_dir) / f"{date}.html.gz"
+    tmp_path = html_path.with_name(html_path.name + '.tmp')
+    tmp_path.write_bytes(gzip.compress(html_content.encode('utf-8')))
+    os.replace(tmp_path, html_path)
+
 
-    for json_file in json_path.glob('*.json'):
-        with open(json_file, 'r', encoding='utf-8') as f:
-            playlist = json.load(f)
-            all_playlists.append(playlist)
+def playlist_date_key(playlist):
+    """Sort key for the consolidated file: undated playlists first"""
+    return playlist['date'] if playlist['date'] else '0000-00-00'
 
-    # Sort by date
-    all_playlists.sort(key=lambda x: x['date'] if x['date'] else '0000-00-00')
+
+def merge_playlists(all_playlists, changed):
+    """Insert or replace changed playlists in the date-sorted list, in place"""
+    for playlist in changed:
+        key = playlist_date_key(playlist)
+        i = bisect.bisect_left(all_playlists, key, key=playlist_date_key)
+        if i < len(all_playlists) and playlist_date_key(all_playlists[i]) == key:
+            all_playlists[i] = playlist
+        else:
+            all_playlists.insert(i, playlist)
+
+
+def update_consolidated_json(json_dir='json/individual', output_file='json/playlists.json', changed_dates=None,
+                             manifest_path=MANIFEST_PATH):
+    """
+    Update the consolidated playlists.json file. With changed_dates, only
+    those playlists are merged into the existing file; otherwise (or if
+    there is no existing file) it is rebuilt from every individual file.
+    The parser's digest manifest, if present, is updated to match.
+    """
+    json_path = Path(json_dir)
+    all_playlists = None
+
+    # Pick up the files saved this run; the index maps dates to files
+    index = refresh_archive_index(json_dir)
+
+    if changed_dates is not None:
+        try:
+            with open(output_file, 'r', encoding='utf-8') as f:
+                all_playlists = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            all_playlists = None
+
+    if all_playlists is None:
+        all_playlists = []
+        for json_file in json_path.glob('*.json'):
+            with open(json_file, 'r', encoding='utf-8') as f:
+                playlist = json.load(f)
+                all_playlists.append(playlist)
+
+        # Sort by date
+        all_playlists.sort(key=playlist_date_key)
+        merged = None
+    else:
+        changed = []
+        for date in sorted(changed_dates):
+            if date not in index:
+                print(f"  Warning: no archived playlist for {date}, skipping")
+                continue
+            with open(json_path / index[date]['file'], 'r', encoding='utf-8') as f:
+                changed.append(json.load(f))
+        merge_playlists(all_playlists, changed)
+        merged = len(changed)
 
     # Save consolidated file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(all_playlists, f, indent=2, ensure_ascii=False)
+    write_json_atomic(all_playlists, output_file)
+
+    # Keep the manifest in step so the validator doesn't flag the new playlists
+    digests = {p['date']: playlist_digest(p) for p in (all_playlists if merged is None else changed) if p.get('date')}
+    files = {'consolidated': {'path': str(output_file), 'sha256': bytes_digest(output_file)}}
+    if manifest_path and update_manifest(digests, files, manifest_path, replace=merged is None):
+        print(f"  Updated digest manifest: {manifest_path}")
 
     print(f"\n✓ Updated consolidated file: {output_file}")
+    if merged is not None:
+        print(f"  Merged playlists: {merged}")
     print(f"  Total playlists: {len(all_playlists)}")
+    return len(all_playlists)
+
+
+def load_journal(journal_path=JOURNAL_PATH):
+    """Dates already fetched and saved, according to the checkpoint journal"""
+    completed = set()
+    try:
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn final line from an interrupted run
+                if record.get('status') == 'fetched':
+                    completed.add(record['date'])
+    except FileNotFoundError:
+        pass
+    return completed
+
+
+def append_journal(journal_file, record):
+    """Append one record and flush it to disk, so it survives an interruption"""
+    journal_file.write(json.dumps(record) + '\n')
+    journal_file.flush()
+    os.fsync(journal_file.fileno())
+
+
+def fetch_and_extract(playlist_info, limiter):
+    """Fetch and extract one playlist (runs in a worker thread), returning (playlist, html)"""
+    limiter.wait()
+    html_content = fetch_playlist_page(playlist_info['url'])
+    if not html_content:
+        return None, None
+    return extract_playlist_from_html(html_content, playlist_info['url']), html_content
 
 
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description='Fetch playlists listed as missing in data/gap_analysis.json')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of pages to fetch concurrently (default: 1)')
+    parser.add_argument('--rate', type=float, default=1.0,
+                        help='Maximum requests per second across all workers (default: 1)')
+    parser.add_argument('--journal', default=JOURNAL_PATH,
+                        help=f'Checkpoint journal of completed dates (default: {JOURNAL_PATH})')
+    parser.add_argument('--fresh', action='store_true',
+                        help='Ignore the journal and fetch every missing playlist again')
+    http_client.add_arguments(parser)
+    html_extract.add_arguments(parser)
+    args = parser.parse_args()
+    jobs = max(1, args.jobs)
+    http_client.configure_from_args(args, pool_size=max(10, jobs))
+    html_extract.configure_from_args(args)
+
     print("Cyprus Avenue Missing Playlist Fetcher")
     print("=" * 70)
 
@@ -233,48 +328,76 @@ def main():
         print("No missing playlists found!")
         return
 
-    print(f"Found {len(missing_playlists)} missing playlists to fetch\n")
+    # Skip work a previous, interrupted run already finished
+    if args.fresh and Path(args.journal).exists():
+        Path(args.journal).unlink()
+    completed = load_journal(args.journal)
+    pending = [p for p in missing_playlists if p['date'] not in completed]
+    resumed_dates = {p['date'] for p in missing_playlists if p['date'] in completed}
+    resumed = len(missing_playlists) - len(pending)
+
+    print(f"Found {len(missing_playlists)} missing playlists to fetch")
+    if resumed:
+        print(f"Skipping {resumed} already fetched (from {args.journal})")
+    print()
 
     fetched = 0
     failed = 0
+    fetched_dates = set()
+    limiter = TokenBucket(args.rate)
+    Path(args.journal).parent.mkdir(parents=True, exist_ok=True)
 
-    for i, playlist_info in enumerate(missing_playlists, 1):
-        url = playlist_info['url']
-        date = playlist_info['date']
-        title = playlist_info['title']
-
-        print(f"\n[{i}/{len(missing_playlists)}] {date} - {title}")
-
-        # Fetch page
-        html_content = fetch_playlist_page(url)
-        if not html_content:
-            failed += 1
-            continue
-
-        # Extract playlist data
-        playlist_data = extract_playlist_from_html(html_content, url)
-
-        # Save playlist
-        if save_playlist(playlist_data):
-            fetched += 1
-        else:
-            failed += 1
-
-        # Be nice to the server
-        if i < len(missing_playlists):
-            time.sleep(1)
-
-    # Update consolidated JSON
-    if fetched > 0:
-        update_consolidated_json()
+    # Queued pages are cancelled on Ctrl-C; only the ones already in flight finish
+    executor = ThreadPoolExecutor(max_workers=jobs)
+    interrupted = False
+    try:
+        with open(args.journal, 'a', encoding='utf-8') as journal_file:
+            futures = {executor.submit(fetch_and_extract, info, limiter): info for info in pending}
+
+            for i, future in enumerate(as_completed(futures), 1):
+                playlist_info = futures[future]
+                date = playlist_info['date']
+                print(f"\n[{i}/{len(pending)}] {date} - {playlist_info['title']}")
+
+                try:
+                    playlist_data, html_content = future.result()
+                except Exception as e:
+                    print(f"  Error extracting playlist: {e}")
+                    playlist_data = None
+
+                # Save playlist and page (in this thread, so writes never interleave)
+                if playlist_data and save_playlist(playlist_data, html_content=html_content):
+                    fetched += 1
+                    fetched_dates.add(playlist_data['date'])
+                    append_journal(journal_file, {'date': date, 'url': playlist_info['url'], 'status': 'fetched',
+                                                  'tracks': len(playlist_data['tracks'])})
+                else:
+                    failed += 1
+                    append_journal(journal_file, {'date': date, 'url': playlist_info['url'], 'status': 'failed'})
+    except KeyboardInterrupt:
+        interrupted = True
+        executor.shutdown(wait=False, cancel_futures=True)
+        print(f"\n\nInterrupted: {fetched} playlists saved; run again to fetch the rest")
+    else:
+        executor.shutdown()
+
+    # Merge this run's playlists (and any an interrupted run saved) into the consolidated JSON
+    total = None
+    if fetched > 0 or resumed > 0:
+        total = update_consolidated_json(changed_dates=fetched_dates | resumed_dates)
 
     # Summary
     print(f"\n{'=' * 70}")
     print(f"Fetch Summary")
     print(f"{'=' * 70}")
     print(f"Successfully fetched: {fetched}")
+    if resumed:
+        print(f"Already fetched in a previous run: {resumed}")
     print(f"Failed: {failed}")
-    print(f"\nArchive now contains {119 + fetched} playlists")
+    if total is not None:
+        print(f"\nArchive now contains {total} playlists")
+    if interrupted:
+        sys.exit(130)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+HTML extraction backends for the KCUR scrapers.
+
+Listing pages have two backends:
+  soup - builds the full tree and searches it for anchors
+  fast - parses only the anchors (SoupStrainer)
+
+Both produce identical results; run this file to compare them and time
+the difference on the committed fixtures (fixtures/html/) or any directory
+of saved pages, e.g. the HTTP cache. Show pages always build the full
+tree: their title, headers and lists can sit anywhere in the page.
+"""
+
+import argparse
+import gzip
+import re
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+
+BACKENDS = ('fast', 'soup')
+FIXTURE_DIR = Path(__file__).resolve().parent / 'fixtures' / 'html'
+PARSERS = ('html.parser', 'lxml', 'html5lib')
+
+TITLE_CLASS_RE = re.compile('title|headline')
+BODY_CLASS_RE = re.compile('article-body|content|description|body')
+BODY_EXCLUDED_TAGS = ('script', 'style', 'nav', 'header', 'footer')
+HEADER_TAGS = ('h2', 'h3', 'h4', 'strong', 'b')
+TRACK_MARKERS = ('track list', 'tracks', 'playlist', 'songs')
+
+_settings = {'backend': 'fast', 'parser': 'html.parser'}
+
+
+def configure(backend='fast', parser='html.parser'):
+    """Select the extraction backend and the underlying HTML parser"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown HTML backend: {backend}")
+    _settings.update(backend=backend, parser=parser)
+
+
+def add_arguments(parser):
+    """Add the HTML extraction options shared by the discovery scripts"""
+    parser.add_argument('--html-backend', choices=BACKENDS, default='fast',
+                        help='Listing page extraction backend (default: fast)')
+    parser.add_argument('--html-parser', choices=PARSERS, default='html.parser',
+                        help='Parser used by BeautifulSoup; lxml is faster if installed (default: html.parser)')
+
+
+def configure_from_args(args):
+    """Configure extraction from add_arguments() options"""
+    configure(args.html_backend, args.html_parser)
+
+
+def listing_links(html, backend=None, parser=None):
+    """(href, text) for every anchor with an href, in document order"""
+    backend = backend or _settings['backend']
+    parser = parser or _settings['parser']
+
+    if backend == 'fast':
+        soup = BeautifulSoup(html, parser, parse_only=SoupStrainer('a', href=True))
+    else:
+        soup = BeautifulSoup(html, parser)
+
+    return [(a.get('href'), a.get_text(strip=True)) for a in soup.find_all('a', href=True)]
+
+
+def show_page_sections(html, parser=None):
+    """
+    (title, description, track_section) of a show page. track_section is
+    the Tag (or None) the caller pulls track lines from.
+    """
+    soup = BeautifulSoup(html, parser or _settings['parser'])
+
+    title = ""
+    title_elem = soup.find('h1') or soup.find('h2', class_=TITLE_CLASS_RE)
+    if title_elem:
+        title = title_elem.get_text(strip=True)
+
+    description = ""
+    article_body = soup.find('div', class_=BODY_CLASS_RE)
+    if article_body:
+        for script in article_body(list(BODY_EXCLUDED_TAGS)):
+            script.decompose()
+        description = article_body.get_text(separator=' ', strip=True)
+
+    track_section = None
+    for header in soup.find_all(list(HEADER_TAGS)):
+        header_text = header.get_text(strip=True).lower()
+        if any(marker in header_text for marker in TRACK_MARKERS):
+            track_section = header.find_next_sibling()
+            break
+
+    if not track_section:
+        for lst in soup.find_all(['ul', 'ol']):
+            if len(lst.find_all('li')) >= 3:
+                track_section = lst
+                break
+
+    if not track_section and article_body:
+        track_section = article_body
+
+    return title, description, track_section
+
+
+def iter_saved_pages(html_dir):
+    """(path, html bytes) for saved .html and .html.gz pages under html_dir"""
+    for path in sorted(Path(html_dir).rglob('*')):
+        if path.name.endswith('.html.gz'):
+            with gzip.open(path, 'rb') as f:
+                yield path, f.read()
+        elif path.suffix in ('.html', '.htm'):
+            yield path, path.read_bytes()
+
+
+def compare_backends(html_dir, parser='html.parser'):
+    """Check that both listing backends agree on every saved page, timing each"""
+    timings = {backend: 0.0 for backend in BACKENDS}
+    pages = 0
+    mismatches = []
+
+    for path, html in iter_saved_pages(html_dir):
+        pages += 1
+        results = {}
+        for backend in BACKENDS:
+            start = time.perf_counter()
+            results[backend] = listing_links(html, backend, parser)
+            timings[backend] += time.perf_counter() - start
+        if results['fast'] != results['soup']:
+            mismatches.append(path)
+
+    print(f"📄 Compared {pages} pages ({parser})")
+    for backend in BACKENDS:
+        print(f"   {backend}: {timings[backend]:.2f}s")
+    if mismatches:
+        print(f"\n❌ {len(mismatches)} pages differ:")
+        for path in mismatches[:20]:
+            print(f"   - {path}")
+        return False
+
+    print("\n✅ Backends produce identical results")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the listing extraction backends on saved pages')
+    parser.add_argument('html_dir', nargs='?', default=FIXTURE_DIR,
+                        help='Directory of saved .html/.html.gz pages (default: the committed fixtures; '
+                             'or e.g. data/http_cache)')
+    parser.add_argument('--html-parser', choices=PARSERS, default='html.parser',
+                        help='Parser used by BeautifulSoup (default: html.parser)')
+    args = parser.parse_args()
+
+    if not compare_backends(args.html_dir, args.html_parser):
+        exit(1)
+
+
+if __name__ == '__main__':
+    main()
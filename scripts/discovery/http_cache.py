@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+On-disk HTTP response cache for the KCUR scrapers.
+
+Bodies are stored with their ETag/Last-Modified validators, and later
+fetches send conditional requests so an unchanged page costs a 304 instead
+of a full download. With a TTL, responses younger than the TTL are served
+straight from disk, which allows fully offline re-runs.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import requests
+
+
+DEFAULT_CACHE_DIR = 'data/http_cache'
+
+
+class CachedResponse:
+    """Minimal stand-in for requests.Response, for bodies served from the cache"""
+
+    def __init__(self, url, status_code, content, from_cache=False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class ResponseCache:
+    """Stores response bodies and validators, one entry per URL"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=None):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.html.gz"
+
+    def _load(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with gzip.open(body_path, 'rb') as f:
+                return meta, f.read()
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return None, None
+
+    def _store(self, url, meta, body):
+        meta_path, body_path = self._paths(url)
+        for path, data in ((body_path, gzip.compress(body)),
+                           (meta_path, json.dumps(meta).encode('utf-8'))):
+            tmp_path = path.with_name(path.name + '.tmp')
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+
+    def get(self, url, fetch, headers=None, timeout=None):
+        """
+        GET url through the cache, using fetch(url, headers=..., timeout=...)
+        for network requests. Returns a requests.Response for uncached
+        non-200 responses, otherwise a CachedResponse with the (possibly
+        cached) body.
+        """
+        meta, body = self._load(url)
+
+        if meta and self.ttl is not None and time.time() - meta['fetched_at'] < self.ttl:
+            return CachedResponse(url, 200, body, from_cache=True)
+
+        request_headers = dict(headers or {})
+        if meta:
+            if meta.get('etag'):
+                request_headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                request_headers['If-Modified-Since'] = meta['last_modified']
+
+        response = fetch(url, headers=request_headers, timeout=timeout)
+
+        if response.status_code == 304 and meta:
+            meta['fetched_at'] = time.time()
+            self._store(url, meta, body)
+            return CachedResponse(url, 200, body, from_cache=True)
+
+        if response.status_code != 200:
+            return response
+
+        meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': time.time(),
+        }
+        self._store(url, meta, response.content)
+        return CachedResponse(url, 200, response.content)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for the discovery scripts.
+
+All requests go through one pooled requests.Session, so connections to
+KCUR are kept alive and reused instead of opening a new TCP/TLS connection
+per page. Every request has a timeout, and 429/5xx responses are retried
+with exponential backoff, honoring Retry-After. Responses go through the
+on-disk response cache when one is configured.
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from http_cache import DEFAULT_CACHE_DIR, ResponseCache
+
+
+# (connect, read) timeout in seconds
+DEFAULT_TIMEOUT = (10, 30)
+DEFAULT_RETRIES = 5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_settings = {'retries': DEFAULT_RETRIES, 'pool_size': 10}
+_session = None
+_session_lock = threading.Lock()
+_response_cache = None
+
+
+def build_session(retries=DEFAULT_RETRIES, pool_size=10):
+    """Session with keep-alive pooling and retry/backoff on 429/5xx"""
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,  # 0.5s, 1s, 2s, 4s, ...
+        backoff_max=60,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session():
+    """The shared session, created on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = build_session(**_settings)
+        return _session
+
+
+def _session_get(url, headers=None, timeout=DEFAULT_TIMEOUT):
+    return get_session().get(url, headers=headers, timeout=timeout)
+
+
+def get(url, headers=None, timeout=DEFAULT_TIMEOUT):
+    """GET url through the shared session and, if configured, the response cache"""
+    if _response_cache is None:
+        return _session_get(url, headers=headers, timeout=timeout)
+    return _response_cache.get(url, _session_get, headers=headers, timeout=timeout)
+
+
+def configure(cache_dir=DEFAULT_CACHE_DIR, ttl=None, cache_enabled=True,
+              retries=DEFAULT_RETRIES, pool_size=10):
+    """Set up the response cache and the shared session's retry/pool settings"""
+    global _response_cache, _session
+    _response_cache = ResponseCache(cache_dir, ttl) if cache_enabled else None
+    with _session_lock:
+        _settings.update(retries=retries, pool_size=pool_size)
+        _session = None
+
+
+def add_arguments(parser):
+    """Add the HTTP options shared by the discovery scripts"""
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f'HTTP response cache directory (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--cache-ttl', type=float,
+                        help='Serve cached pages younger than this many seconds without revalidating')
+    parser.add_argument('--offline', action='store_true',
+                        help='Serve every cached page without contacting the server')
+    parser.add_argument('--no-http-cache', action='store_true', help='Always download full pages')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                        help=f'Retries for 429/5xx responses and connection errors (default: {DEFAULT_RETRIES})')
+
+
+def configure_from_args(args, pool_size=10):
+    """Configure the client from add_arguments() options"""
+    ttl = float('inf') if args.offline else args.cache_ttl
+    configure(args.cache_dir, ttl, cache_enabled=not args.no_http_cache,
+              retries=args.retries, pool_size=pool_size)
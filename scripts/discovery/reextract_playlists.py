@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Re-extract fetched playlists from the stored HTML archive, without the network.
+
+Runs extract_playlist_from_html() in parallel over archive/html/*.html.gz,
+rewrites json/individual/{date}.json for playlists whose extraction changed
+(keeping their original archived_date) and merges those dates into the
+consolidated file. Use after a fix to the extractor.
+"""
+
+import argparse
+import gzip
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import html_extract
+from fetch_missing_playlists import (
+    HTML_ARCHIVE_DIR, extract_playlist_from_html, save_playlist, update_consolidated_json
+)
+
+
+def source_url(date, json_dir):
+    """URL a stored page was fetched from, per its playlist JSON (or rebuilt from the date)"""
+    try:
+        with open(Path(json_dir) / f"{date}.json", 'r', encoding='utf-8') as f:
+            existing = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        existing = None
+    url = existing.get('source_url') if existing else None
+    return url or f"https://www.kcur.org/{date}/", existing
+
+
+def _reextract_file(task):
+    """Extract one stored page (runs in a worker process)"""
+    html_path, url, backend, parser = task
+    html_extract.configure(backend, parser)
+    try:
+        with gzip.open(html_path, 'rb') as f:
+            html_content = f.read().decode('utf-8')
+        return html_path, extract_playlist_from_html(html_content, url), None
+    except Exception as e:
+        return html_path, None, str(e)
+
+
+def same_playlist(a, b):
+    """Compare playlists, ignoring when they were archived"""
+    strip = lambda p: {k: v for k, v in p.items() if k != 'archived_date'}
+    return strip(a) == strip(b)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-extract fetched playlists from stored HTML')
+    parser.add_argument('--html-dir', default=HTML_ARCHIVE_DIR,
+                        help=f'Stored pages (default: {HTML_ARCHIVE_DIR})')
+    parser.add_argument('--json-dir', default='json/individual', help='Individual playlist JSON directory')
+    parser.add_argument('--jobs', type=int, default=0,
+                        help='Number of worker processes (default: 0 = one per CPU core)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Report which playlists would change without writing anything')
+    html_extract.add_arguments(parser)
+    args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    print("Cyprus Avenue Playlist Re-extraction")
+    print("=" * 70)
+
+    html_files = sorted(Path(args.html_dir).glob('*.html.gz'))
+    if not html_files:
+        print(f"No stored pages found in {args.html_dir}")
+        return
+
+    tasks = []
+    existing_by_path = {}
+    for html_path in html_files:
+        date = html_path.name[:-len('.html.gz')]
+        url, existing = source_url(date, args.json_dir)
+        existing_by_path[html_path] = existing
+        tasks.append((html_path, url, args.html_backend, args.html_parser))
+
+    print(f"Re-extracting {len(tasks)} stored pages with {jobs} workers...\n")
+
+    changed_dates = set()
+    unchanged = 0
+    failed = 0
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for html_path, playlist, error in executor.map(_reextract_file, tasks, chunksize=8):
+            if error is not None or not playlist or not playlist['date']:
+                print(f"✗ {html_path.name}: {error or 'no date found'}")
+                failed += 1
+                continue
+
+            existing = existing_by_path[html_path]
+            if existing and same_playlist(existing, playlist):
+                unchanged += 1
+                continue
+
+            if existing and existing.get('archived_date'):
+                playlist['archived_date'] = existing['archived_date']
+
+            old_count = len(existing['tracks']) if existing else 0
+            print(f"{'~' if existing else '+'} {playlist['date']}: {old_count} → {len(playlist['tracks'])} tracks")
+            if not args.dry_run:
+                save_playlist(playlist, args.json_dir)
+            changed_dates.add(playlist['date'])
+
+    if changed_dates and not args.dry_run:
+        update_consolidated_json(args.json_dir, changed_dates=changed_dates)
+
+    print(f"\n{'=' * 70}")
+    print(f"Re-extraction Summary")
+    print(f"{'=' * 70}")
+    print(f"{'Would change' if args.dry_run else 'Changed'}: {len(changed_dates)}")
+    print(f"Unchanged: {unchanged}")
+    print(f"Failed: {failed}")
+
+
+if __name__ == '__main__':
+    main()
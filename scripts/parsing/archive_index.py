@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Date index of the archived playlist JSON files.
+
+Maps each archived date to its file, digest, track count and title, so
+scans that only need to know what is archived (gap analysis, the
+consolidated-file merge, the validator) read one small file instead of
+decoding every playlist. Entries are checked against file size/mtime, so
+refreshing a stale index only re-reads the files that changed.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from json_io import write_json_atomic
+from playlist_manifest import playlist_digest
+
+
+ARCHIVE_INDEX_PATH = 'json/.archive_index.json'
+
+
+def index_entry(filename, stat, playlist):
+    """Index entry for one playlist file"""
+    return {
+        'file': filename,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'digest': playlist_digest(playlist),
+        'track_count': len(playlist.get('tracks') or []),
+        'title': playlist.get('title'),
+    }
+
+
+def load_archive_index(json_dir='json/individual', index_path=ARCHIVE_INDEX_PATH):
+    """Stored {date: entry} index of json_dir, or {} if missing, unreadable or for another directory"""
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if not isinstance(index, dict) or index.get('json_dir') != str(Path(json_dir)):
+        return {}
+    return index.get('dates', {})
+
+
+def save_archive_index(json_dir, index_path, dates):
+    """Atomically write the {date: entry} index of json_dir"""
+    write_json_atomic({'json_dir': str(Path(json_dir)), 'dates': dict(sorted(dates.items()))}, index_path)
+
+
+def refresh_archive_index(json_dir='json/individual', index_path=ARCHIVE_INDEX_PATH):
+    """
+    Bring the index up to date with json_dir and return it as
+    {date: entry}. Files whose size and mtime match their entry are not
+    opened; new or edited files are decoded and re-indexed, and entries for
+    deleted files are dropped. Files without a date are left out.
+    Pass index_path=None to index without reading or writing a stored index.
+    """
+    stored = load_archive_index(json_dir, index_path) if index_path else {}
+    by_file = {entry['file']: (date, entry) for date, entry in stored.items()}
+    dates = {}
+    changed = False
+
+    if not Path(json_dir).exists():
+        return dates
+
+    with os.scandir(json_dir) as it:
+        for dir_entry in sorted(it, key=lambda e: e.name):
+            if not dir_entry.name.endswith('.json') or not dir_entry.is_file():
+                continue
+
+            stat = dir_entry.stat()
+            date, cached = by_file.get(dir_entry.name, (None, None))
+            if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+                dates[date] = cached
+                continue
+
+            try:
+                with open(dir_entry.path, 'r', encoding='utf-8') as f:
+                    playlist = json.load(f)
+            except (json.JSONDecodeError, UnicodeDecodeError, OSError):
+                continue
+            if not isinstance(playlist, dict) or not playlist.get('date'):
+                continue
+
+            dates[playlist['date']] = index_entry(dir_entry.name, stat, playlist)
+            changed = True
+
+    if index_path and (changed or dates.keys() != stored.keys()):
+        save_archive_index(json_dir, index_path, dates)
+    return dates
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Canonical artist names and ids, applied while parsing.
+
+The same act shows up under several spellings: title-derived artists
+("The Beatles' 12 Greatest Hits" -> "The Beatles") next to track lines
+("Beatles"), curly vs straight quotes, "&" vs "and", typos. Every track
+gets an artist_id next to its display name: the slug of the name's
+normalized form, so those variants share one id. Corrections that
+normalizing can't catch ("Rhianon Giddens") live in the curated table
+data/artist_aliases.json, {variant: canonical name}; tracks it applies
+to get the corrected name as canonical_artist and its id.
+
+The artist field itself is never rewritten: with the song it forms the
+"Artist|Song" key of spotify-index.json and the web app's lookups.
+
+Lookups are memoized, so each raw string is resolved once per process.
+"""
+
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+
+import near_duplicates
+from near_duplicates import normalize_name
+
+
+ARTIST_ALIASES_PATH = 'data/artist_aliases.json'
+
+
+@lru_cache(maxsize=None)
+def load_artist_aliases(path=ARTIST_ALIASES_PATH):
+    """Curated alias table keyed by the normalized variant, or {} if there is none"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            aliases = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return {normalize_name(variant): canonical for variant, canonical in aliases.items()}
+
+
+def artist_id(name):
+    """Id shared by every spelling of a name that normalizes the same way"""
+    normalized = normalize_name(name) or name.strip().lower()
+    return normalized.replace(' ', '-')
+
+
+@lru_cache(maxsize=None)
+def canonical_artist(name):
+    """(display name, artist id) for a raw artist string"""
+    if not name:
+        return name, None
+    name = load_artist_aliases().get(normalize_name(name), name)
+    return name, artist_id(name)
+
+
+def canonicalize_tracks(tracks):
+    """Tracks with an artist_id (and canonical_artist, if corrected) after each artist"""
+    result = []
+    for track in tracks:
+        name, canonical_id = canonical_artist(track.get('artist'))
+        canonical = {'artist': track.get('artist'), 'artist_id': canonical_id}
+        if name != track.get('artist'):
+            canonical['canonical_artist'] = name
+        canonical.update((key, value) for key, value in track.items()
+                         if key not in ('artist', 'artist_id', 'canonical_artist'))
+        result.append(canonical)
+    return result
+
+
+def aliases_fingerprint(path=ARTIST_ALIASES_PATH):
+    """Hash of the alias table and the code applying it, for parse cache invalidation"""
+    digest = hashlib.sha256()
+    for source in (Path(__file__), Path(near_duplicates.__file__)):
+        digest.update(source.read_bytes())
+    try:
+        digest.update(Path(path).read_bytes())
+    except FileNotFoundError:
+        pass
+    return digest.hexdigest()[:16]
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Scale benchmark for the parse/validate pipeline.
+
+Generates synthetic show archives that mimic the real archive/txt formats
+and reports throughput, peak RSS and per-stage wall time for a cold parse,
+a re-parse against the warm parse cache, and validate. Parsing streams
+into the consolidated file through the parse cache, as parse_playlists.py
+does.
+
+Usage:
+    python benchmark_pipeline.py                      # 1k, 10k and 100k shows
+    python benchmark_pipeline.py --sizes 1000 5000    # Custom corpus sizes
+    python benchmark_pipeline.py --keep --workdir /tmp/bench --output results.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from parse_playlists import iter_all_playlists, write_playlists
+from validate_playlists import validate_playlists
+
+
+FIRST_NAMES = ['Bob', 'Van', 'Rosanne', 'Jerry Lee', 'Nicole', 'Leonard', 'Willie', 'Smokey',
+               'Aretha', 'Ray', 'Emmylou', 'Lucinda', 'Mavis', 'Allen', 'Tom', 'Eilen']
+LAST_NAMES = ['Dylan', 'Morrison', 'Cash', 'Lewis', 'Atkins', 'Cohen', 'Nelson', 'Robinson',
+              'Franklin', 'Charles', 'Harris', 'Williams', 'Staples', 'Toussaint', 'Waits', 'Jewell']
+BANDS = ['Sly and the Family Stone', 'The Band', 'Los Lobos', 'The Staple Singers',
+         'Booker T. & the M.G.s', 'The Neville Brothers', 'Calexico', 'My Morning Jacket']
+SONG_WORDS = ['Kansas', 'City', 'River', 'Blue', 'Night', 'Train', 'Heart', 'Road', 'Rain',
+              'Gambler', 'Feather', 'Bird', 'Dancing', 'Dark', 'Time', 'Home', 'Moon', 'Fire',
+              'Angel', 'Midnight', 'Highway', 'Soul', 'Sweet', 'Lonesome']
+
+
+def random_artist(rng):
+    if rng.random() < 0.25:
+        return rng.choice(BANDS)
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def random_title(rng, min_words=1, max_words=4):
+    return ' '.join(rng.choice(SONG_WORDS) for _ in range(rng.randint(min_words, max_words)))
+
+
+def show_header(rng, title, show_date):
+    """Title, byline and share-widget boilerplate as copy/pasted from KCUR pages"""
+    return [
+        title,
+        f"By BILL SHAPIRO • {show_date.strftime('%b %-d, %Y').upper()}",
+        'Cyprus Avenue',
+        'Tweet',
+        'Share',
+        'Google+',
+        'Email',
+        f"This week on Cyprus Avenue, Bill Shapiro plays {random_title(rng, 3, 6).lower()}.",
+        '',
+        'CREDIT FLICKR',
+    ]
+
+
+def generate_artist_song_show(rng, show_date):
+    """Track List: section with Artist- "Song" lines"""
+    lines = show_header(rng, random_title(rng, 2, 4), show_date)
+    lines.append('Track List:')
+    for _ in range(rng.randint(8, 16)):
+        dash = rng.choice(['- ', ' - ', ' – '])
+        lines.append('')
+        lines.append(f"{random_artist(rng)}{dash}“{random_title(rng)}”")
+    return lines
+
+
+def generate_quote_only_show(rng, show_date):
+    """Single-artist show listing only quoted song titles"""
+    artist = random_artist(rng)
+    lines = show_header(rng, f"{artist} Redux", show_date)
+    lines.append('Tracks:')
+    for _ in range(rng.randint(8, 14)):
+        lines.append(f"“{random_title(rng)}”")
+    return lines
+
+
+def generate_best_of_show(rng, show_date):
+    """Year-end "Artist, Album" list with no track list marker"""
+    lines = [f"{show_date.year} Favorites", f"By BILL SHAPIRO • {show_date.year}", '']
+    for i in range(rng.randint(8, 12)):
+        lines.append(f"{i + 1}. {random_artist(rng)}, {random_title(rng, 1, 3)}")
+    return lines
+
+
+def generate_whitespace_show(rng, show_date):
+    """Artist and song separated by a run of spaces"""
+    lines = show_header(rng, random_title(rng, 2, 3), show_date)
+    lines.append('Playlist:')
+    for _ in range(rng.randint(8, 14)):
+        lines.append(f"{random_artist(rng)}{' ' * rng.randint(5, 12)}{random_title(rng)}")
+    return lines
+
+
+SHOW_GENERATORS = [
+    (generate_artist_song_show, 0.55),
+    (generate_quote_only_show, 0.2),
+    (generate_best_of_show, 0.1),
+    (generate_whitespace_show, 0.15),
+]
+
+
+def generate_corpus(txt_dir, num_shows, seed=0):
+    """Write num_shows synthetic playlist txt files, one per day from 1978-01-01"""
+    rng = random.Random(seed)
+    txt_path = Path(txt_dir)
+    txt_path.mkdir(parents=True, exist_ok=True)
+
+    generators = [g for g, _ in SHOW_GENERATORS]
+    weights = [w for _, w in SHOW_GENERATORS]
+    start = date(1978, 1, 1)
+
+    for i in range(num_shows):
+        show_date = start + timedelta(days=i)
+        generator = rng.choices(generators, weights)[0]
+        lines = generator(rng, show_date)
+        (txt_path / f"{show_date.isoformat()}.txt").write_text('\n'.join(lines), encoding='utf-8')
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_stages(workdir):
+    """Run a cold parse, a cached re-parse and validate over workdir/txt, returning timings"""
+    workdir = Path(workdir)
+    json_dir = workdir / 'json'
+    individual_dir = json_dir / 'individual'
+    consolidated_path = json_dir / 'playlists.json'
+    cache_path = json_dir / '.parse_cache.json'
+    if json_dir.exists():
+        shutil.rmtree(json_dir)
+    json_dir.mkdir(parents=True)
+
+    timings = {}
+    counts = {'shows': 0, 'tracks': 0}
+    quiet = io.StringIO()
+
+    def tally(playlists):
+        for playlist in playlists:
+            counts['shows'] += 1
+            counts['tracks'] += len(playlist['tracks'])
+            yield playlist
+
+    with contextlib.redirect_stdout(quiet):
+        start = time.perf_counter()
+        write_playlists(tally(iter_all_playlists(workdir / 'txt', individual_dir, cache_path=cache_path)),
+                        consolidated_path)
+        timings['parse'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_playlists(iter_all_playlists(workdir / 'txt', individual_dir, cache_path=cache_path),
+                        consolidated_path)
+        timings['cached_parse'] = time.perf_counter() - start
+        parse_rss = peak_rss_mb()
+
+        start = time.perf_counter()
+        validate_playlists(str(individual_dir), str(consolidated_path),
+                           cache_path=None, manifest_path=None, web_path=None, clusters_path=None)
+        timings['validate'] = time.perf_counter() - start
+
+    return {
+        'shows': counts['shows'],
+        'tracks': counts['tracks'],
+        'timings': timings,
+        'parse_peak_rss_mb': parse_rss,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def benchmark_size(num_shows, workdir, seed=0):
+    """Generate a corpus and run the stages in a fresh process so peak RSS is per size"""
+    generate_corpus(Path(workdir) / 'txt', num_shows, seed=seed)
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--run-stages', str(workdir)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+def print_report(results):
+    print(f"\n{'=' * 81}")
+    print("Pipeline Scale Benchmark")
+    print(f"{'=' * 81}")
+    print(f"{'Shows':>8} {'Tracks':>9} {'Parse s':>9} {'Cached s':>9} {'Valid. s':>9} "
+          f"{'Shows/s':>9} {'Parse RSS':>10} {'Peak RSS':>10}")
+    for r in results:
+        t = r['timings']
+        total = t['parse'] + t['validate']
+        throughput = r['shows'] / total if total else 0
+        print(f"{r['shows']:>8} {r['tracks']:>9} {t['parse']:>9.2f} {t['cached_parse']:>9.2f} "
+              f"{t['validate']:>9.2f} {throughput:>9.0f} {r['parse_peak_rss_mb']:>8.1f}MB "
+              f"{r['peak_rss_mb']:>8.1f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the parse/validate pipeline on synthetic archives')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='Corpus sizes (number of shows) to benchmark')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the corpus generator')
+    parser.add_argument('--workdir', help='Directory for generated corpora (default: a temp dir)')
+    parser.add_argument('--keep', action='store_true', help='Keep generated corpora')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--run-stages', metavar='DIR', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Child mode: run the stages and report back as JSON
+    if args.run_stages:
+        print(json.dumps(run_stages(args.run_stages)))
+        return
+
+    base_dir = Path(args.workdir or tempfile.mkdtemp(prefix='cyprus-bench-'))
+    results = []
+
+    try:
+        for size in args.sizes:
+            print(f"Benchmarking {size} shows...")
+            result = benchmark_size(size, base_dir / f"shows-{size}", seed=args.seed)
+            results.append(result)
+    finally:
+        if not args.keep:
+            shutil.rmtree(base_dir, ignore_errors=True)
+
+    print_report(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✓ Saved results to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
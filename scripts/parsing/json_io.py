@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Atomic JSON file writing shared by the pipeline scripts.
+
+Everything the parser, validator, fetcher and Spotify tools write goes to
+a temporary file next to its destination and is renamed into place, so a
+reader (or an interrupted run) never sees a partial file.
+"""
+
+import json
+import os
+from pathlib import Path
+
+
+def write_json_atomic(data, path, compact=False):
+    """
+    Write data as JSON to path via a temp file and os.replace().
+    Pretty-printed with indent=2 by default; compact=True drops all
+    whitespace (caches and indexes nobody reads by eye).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        if compact:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        else:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection for artist names and artist+song pairs.
+
+Spelling variants ("Sly & The Family Stone" vs "Sly and the Family
+Stone", stray whitespace, curly quotes) split stats and multiply
+downstream lookups. Names are first grouped by a normalized form; the
+remaining distinct forms are paired up by MinHash LSH over character
+trigrams and confirmed with a similarity check, so the work grows with
+the number of names rather than the number of pairs.
+
+Clusters are written to json/variant_clusters.json together with a flat
+alias table of the safe (normalized) matches.
+"""
+
+import random
+import re
+import unicodedata
+import zlib
+from collections import defaultdict
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+from json_io import write_json_atomic
+
+
+CLUSTERS_PATH = 'json/variant_clusters.json'
+
+# MinHash LSH: BANDS x ROWS hashes; pairs with trigram Jaccard similarity
+# above roughly (1 / BANDS) ** (1 / ROWS) ~ 0.59 become candidates, which
+# still catches a one-letter typo in a short name
+BANDS = 8
+ROWS = 4
+FUZZY_THRESHOLD = 0.9
+# Buckets bigger than this are dominated by very short names; skip them
+MAX_BUCKET = 50
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240101)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(BANDS * ROWS)]
+
+QUOTES = str.maketrans({'‘': "'", '’': "'", '“': '"', '”': '"', '′': "'"})
+BRACKETED_RE = re.compile(r'\s*[(\[][^)\]]*[)\]]')
+AND_RE = re.compile(r'\s*(?:&|\+)\s*')
+NON_ALNUM_RE = re.compile(r"[^a-z0-9 ]+")
+SPACES_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=None)
+def normalize_name(text, drop_brackets=False):
+    """
+    Comparison form of a name: ASCII, lowercase, no punctuation, '&' as
+    'and', no leading 'the'; with drop_brackets, "(Live)"-style asides go too.
+    Shared with scripts/spotify/resolve_not_found.py.
+    """
+    text = text.translate(QUOTES)
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(c for c in text if not unicodedata.combining(c))
+    text = text.lower()
+    if drop_brackets:
+        text = BRACKETED_RE.sub('', text)
+    text = AND_RE.sub(' and ', text)
+    text = NON_ALNUM_RE.sub('', text.replace('-', ' '))
+    text = SPACES_RE.sub(' ', text).strip()
+    if text.startswith('the '):
+        text = text[4:]
+    return text
+
+
+@lru_cache(maxsize=None)
+def _trigram_hashes(trigram):
+    """The permuted hash values of one trigram, shared by every name containing it"""
+    h = zlib.crc32(trigram.encode('utf-8'))
+    return tuple((a * h + b) % _PRIME for a, b in _PERMUTATIONS)
+
+
+@lru_cache(maxsize=None)
+def minhash(text):
+    """MinHash signature of a string's character trigrams"""
+    padded = f"  {text} "
+    trigrams = {padded[i:i + 3] for i in range(len(padded) - 2)}
+    return tuple(map(min, zip(*(_trigram_hashes(t) for t in trigrams))))
+
+
+def _candidate_pairs(forms):
+    """
+    Pairs of indexes into forms that share at least one LSH band. Each
+    '|'-separated part of a form is hashed on its own and a band must
+    match in every part, so "Artist|Song" pairs only become candidates
+    when both their artists and their songs look alike.
+    """
+    buckets = defaultdict(list)
+    for i, form in enumerate(forms):
+        signatures = [minhash(part) for part in form.split('|')]
+        for band in range(BANDS):
+            rows = slice(band * ROWS, (band + 1) * ROWS)
+            buckets[(band,) + tuple(signature[rows] for signature in signatures)].append(i)
+
+    pairs = set()
+    for members in buckets.values():
+        if len(members) > MAX_BUCKET:
+            continue
+        for j in range(1, len(members)):
+            for i in range(j):
+                pairs.add((members[i], members[j]))
+    return pairs
+
+
+def _same_word_starts(a, b):
+    """
+    Token-level check for fuzzy matches: with the same number of words,
+    every word that differs must keep its first letter. Typos do
+    ("Rhianon"/"Rhiannon", "Bobbi"/"Bobby"); different names often don't
+    ("Cash"/"Nash", "Rain"/"Train").
+    """
+    words_a, words_b = a.split(), b.split()
+    if len(words_a) != len(words_b):
+        return True
+    return all(x == y or x[0] == y[0] for x, y in zip(words_a, words_b))
+
+
+def similar(a, b, threshold=FUZZY_THRESHOLD):
+    """Whether two comparison forms are close enough, trying the cheap checks first"""
+    if 2 * min(len(a), len(b)) < threshold * (len(a) + len(b)):
+        return False
+    if not _same_word_starts(a, b):
+        return False
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    return matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold
+
+
+def similar_tracks(a, b, threshold=FUZZY_THRESHOLD):
+    """Track forms match only if the artists and the songs each do"""
+    artist_a, _, song_a = a.partition('|')
+    artist_b, _, song_b = b.partition('|')
+    return ((artist_a == artist_b or similar(artist_a, artist_b, threshold))
+            and (song_a == song_b or similar(song_a, song_b, threshold)))
+
+
+def find_clusters(counts, key_form=normalize_name, is_similar=similar, threshold=FUZZY_THRESHOLD):
+    """
+    Cluster the raw names in counts ({name: occurrences}) that are spelling
+    variants of each other. Returns a list of clusters, most frequent first:
+    {'canonical': most used variant, 'variants': {name: count},
+     'match': 'normalized' or 'fuzzy', 'aliases': {variant: canonical}}
+    Aliases only cover variants with the same normalized form; fuzzy
+    matches ("Rhianon Giddens" vs "Rhiannon Giddens") are reported for review, never
+    aliased. Only clusters with more than one variant are returned.
+    """
+    by_form = defaultdict(list)
+    for name in counts:
+        by_form[key_form(name)].append(name)
+
+    forms = sorted(by_form)
+    parent = list(range(len(forms)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in _candidate_pairs(forms):
+        if find(i) != find(j) and is_similar(forms[i], forms[j], threshold):
+            parent[find(j)] = find(i)
+
+    groups = defaultdict(list)
+    for i in range(len(forms)):
+        groups[find(i)].append(i)
+
+    by_count = lambda n: (-counts[n], n)
+    clusters = []
+    for members in groups.values():
+        names = [name for i in members for name in by_form[forms[i]]]
+        if len(names) < 2:
+            continue
+        aliases = {}
+        for i in members:
+            same_form = sorted(by_form[forms[i]], key=by_count)
+            aliases.update((name, same_form[0]) for name in same_form[1:])
+        variants = {name: counts[name] for name in sorted(names, key=by_count)}
+        clusters.append({
+            'canonical': next(iter(variants)),
+            'variants': variants,
+            'match': 'normalized' if len(members) == 1 else 'fuzzy',
+            'aliases': aliases,
+        })
+
+    clusters.sort(key=lambda c: (-sum(c['variants'].values()), c['canonical']))
+    return clusters
+
+
+def track_form(key):
+    """Comparison form of an 'Artist|Song' key"""
+    artist, _, song = key.partition('|')
+    return f"{normalize_name(artist)}|{normalize_name(song)}"
+
+
+def write_clusters(artist_clusters, track_clusters, clusters_path=CLUSTERS_PATH):
+    """Atomically write the clusters file, with a flat variant -> canonical alias table per kind"""
+    def aliases(clusters):
+        return {name: canonical for cluster in clusters for name, canonical in cluster['aliases'].items()}
+
+    data = {
+        'artist_aliases': aliases(artist_clusters),
+        'track_aliases': aliases(track_clusters),
+        'artists': artist_clusters,
+        'tracks': track_clusters,
+    }
+    write_json_atomic(data, clusters_path)
@@ -7,85 +7,217 @@ Converts raw copy/pasted text into structured JSON format.
 import re
 import json
 import os
+import argparse
+import hashlib
+import heapq
+import shutil
+from itertools import groupby
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+from archive_index import refresh_archive_index
+from artist_aliases import aliases_fingerprint, canonicalize_tracks
+from json_io import write_json_atomic
+from playlist_db import DB_PATH, iter_db_sync
+from playlist_manifest import MANIFEST_PATH, playlist_digest, bytes_digest, build_manifest, write_manifest
+from playlist_stats import STATS_PATH, TOP_N, new_stats, iter_stats, build_stats
+from near_duplicates import write_clusters
+from track_keys import iter_track_keys, write_track_keys
+from validate_playlists import new_report, iter_validated, finish_report, print_report
+
+
+# Persistent parse cache, keyed on txt content hash + parser fingerprint; each entry
+# records the digest of the individual JSON file it produced
+PARSE_CACHE_PATH = 'json/.parse_cache.json'
+
+# Year-sharded output: one {year}.json per year plus index.json
+SHARD_DIR = 'json/shards'
+SHARD_INDEX_NAME = 'index.json'
+
+
+DATE_FILENAME_RE = re.compile(r'(\d{4}-\d{2}-\d{2})\.txt')
+
 
 def extract_date_from_filename(filename):
     """Extract date from filename like '2015-01-03.txt'"""
-    match = re.match(r'(\d{4}-\d{2}-\d{2})\.txt', filename)
+    match = DATE_FILENAME_RE.match(filename)
     if match:
         return match.group(1)
     return None
 
 
+# Description patterns that explicitly mention an artist, tried in order
+# e.g. "The legendary Artist Name" or "Artist Name is back" or "Singer-songwriter Artist Name's"
+DESCRIPTION_ARTIST_PATTERNS = [re.compile(p) for p in (
+    r'[“"][^""”]+,[”"]\s+the\s+(?:iconic|legendary)\s+([A-Z][a-zA-Z\s\.&]+?)(?:\.|,|$)',  # "old blue eyes," the iconic Frank Sinatra
+    r'[“"][^""”]+,[”"]\s+([A-Z][a-zA-Z\s\.&]+?)(?:\s+through|\s+is|\s+has)',  # "The Boss," Bruce Springsteen
+    r'(?:The legendary|Legendary)\s+([A-Z][a-zA-Z\s\.&]+?)(?:\s+is|\s+has|\s+was)',
+    r'(?:The great|great)\s+([A-Z][a-zA-Z\s\.&]+?)(?:\s+got|\s+is|\s+has|\s+was|\s+with)',  # "The great Jimi Hendrix" or "the great Bob Marley with"
+    r'(?:genius|talent)\s+of\s+([A-Z][a-zA-Z\s\.&]+?)(?:,|\s+has|\s+is|\s+was)',  # "genius of Ray Charles," or "genius of Van Morrison has"
+    r'the music of\s+([A-Z][a-zA-Z\s\.&]+?)(?:\s+inspired|\s+is|\s+on)',  # "the music of Sly and the Family Stone"
+    r'It\'s\s+([A-Z][a-zA-Z\s\.&]+?)\s+on\s+this\s+edition',  # "It's Sly and the Family Stone on this edition"
+    r'^([A-Z][a-zA-Z\s\.&]+?)\s+is back',
+    r'(?:Singer-songwriter|Singer/songwriter)\s+([A-Z][a-zA-Z\s\.&]+?)(?:\'s|\s+is|\s+has)',
+    r'Singer\s+([A-Z][a-zA-Z\s\.&]+?)(?:,|\s+just|\s+is|\s+has|\s+was)',  # "Singer Van Morrison," or "Singer Aaron Neville just"
+)]
+DESCRIPTION_ARTIST_TRAILING_RE = re.compile(r'\s+(is|has|was|got)$')
+
+# Title patterns, tried in order after the description patterns
+TITLE_ARTIST_PATTERNS = [
+    re.compile(r'^([A-Z][a-zA-Z\s\.&]+?)\s+\d{4}\s*[-–—]\s*\d{4}$'),  # "Artist Name YYYY-YYYY"
+    re.compile(r'^([A-Z][a-zA-Z\s\.&]+?)[-:]\s+.+$'),  # "Artist Name- Album Name" or "Artist Name: Album Name"
+    re.compile(r'^(?:Here Comes?|Here\'s)\s+(.+)$', re.IGNORECASE),  # "Here Comes Artist Name" or "Here's Artist Name"
+    re.compile(r'^(.+?)\s+(?:Returns|Redux|Encore)$', re.IGNORECASE),  # "Artist Name Returns/Redux/Encore"
+    re.compile(r'^(.+?)(?:\'s)?\s+Playlist$', re.IGNORECASE),  # "Artist Name Playlist" or "Artist Name's Playlist"
+    re.compile(r'^Remembering\s+(.+)$', re.IGNORECASE),  # "Remembering Artist Name"
+]
+
+
 def extract_artist_from_title_and_description(title, description):
     """Extract artist name from show titles and descriptions"""
     if not title:
         return title
 
     # First, try to extract from description if it explicitly mentions an artist
-    # Pattern: "The legendary Artist Name" or "Artist Name is back" or "Singer-songwriter Artist Name's"
     if description:
-        desc_patterns = [
-            r'[\u201c"][^""\u201d]+,[\u201d"]\s+the\s+(?:iconic|legendary)\s+([A-Z][a-zA-Z\s\.&]+?)(?:\.|,|$)',  # "old blue eyes," the iconic Frank Sinatra
-            r'[\u201c"][^""\u201d]+,[\u201d"]\s+([A-Z][a-zA-Z\s\.&]+?)(?:\s+through|\s+is|\s+has)',  # "The Boss," Bruce Springsteen
-            r'(?:The legendary|Legendary)\s+([A-Z][a-zA-Z\s\.&]+?)(?:\s+is|\s+has|\s+was)',
-            r'(?:The great|great)\s+([A-Z][a-zA-Z\s\.&]+?)(?:\s+got|\s+is|\s+has|\s+was|\s+with)',  # "The great Jimi Hendrix" or "the great Bob Marley with"
-            r'(?:genius|talent)\s+of\s+([A-Z][a-zA-Z\s\.&]+?)(?:,|\s+has|\s+is|\s+was)',  # "genius of Ray Charles," or "genius of Van Morrison has"
-            r'the music of\s+([A-Z][a-zA-Z\s\.&]+?)(?:\s+inspired|\s+is|\s+on)',  # "the music of Sly and the Family Stone"
-            r'It\'s\s+([A-Z][a-zA-Z\s\.&]+?)\s+on\s+this\s+edition',  # "It's Sly and the Family Stone on this edition"
-            r'^([A-Z][a-zA-Z\s\.&]+?)\s+is back',
-            r'(?:Singer-songwriter|Singer/songwriter)\s+([A-Z][a-zA-Z\s\.&]+?)(?:\'s|\s+is|\s+has)',
-            r'Singer\s+([A-Z][a-zA-Z\s\.&]+?)(?:,|\s+just|\s+is|\s+has|\s+was)',  # "Singer Van Morrison," or "Singer Aaron Neville just"
-        ]
-        for pattern in desc_patterns:
-            match = re.search(pattern, description)
+        for pattern in DESCRIPTION_ARTIST_PATTERNS:
+            match = pattern.search(description)
             if match:
                 artist = match.group(1).strip()
                 # Clean up trailing words
-                artist = re.sub(r'\s+(is|has|was|got)$', '', artist)
-                return artist
-
-    # Pattern: "Artist Name YYYY-YYYY" - extract artist before date range
-    match = re.match(r'^([A-Z][a-zA-Z\s\.&]+?)\s+\d{4}\s*[-–—]\s*\d{4}$', title)
-    if match:
-        return match.group(1).strip()
+                return DESCRIPTION_ARTIST_TRAILING_RE.sub('', artist)
 
-    # Pattern: "Artist Name- Album Name" or "Artist Name: Album Name" - extract artist before separator
-    match = re.match(r'^([A-Z][a-zA-Z\s\.&]+?)[-:]\s+.+$', title)
-    if match:
-        return match.group(1).strip()
-
-    # Pattern: "Here Comes Artist Name" or "Here's Artist Name"
-    match = re.match(r'^(?:Here Comes?|Here\'s)\s+(.+)$', title, re.IGNORECASE)
-    if match:
-        return match.group(1).strip()
-
-    # Pattern: "Artist Name Returns" or "Artist Name Redux" or "Artist Name Encore"
-    match = re.match(r'^(.+?)\s+(?:Returns|Redux|Encore)$', title, re.IGNORECASE)
-    if match:
-        return match.group(1).strip()
-
-    # Pattern: "Artist Name Playlist" or "Artist Name's Playlist"
-    match = re.match(r'^(.+?)(?:\'s)?\s+Playlist$', title, re.IGNORECASE)
-    if match:
-        return match.group(1).strip()
-
-    # Pattern: "Remembering Artist Name"
-    match = re.match(r'^Remembering\s+(.+)$', title, re.IGNORECASE)
-    if match:
-        return match.group(1).strip()
+    for pattern in TITLE_ARTIST_PATTERNS:
+        match = pattern.match(title)
+        if match:
+            return match.group(1).strip()
 
     # Default: return the title as-is
     return title
 
 
+LEADING_NON_ALNUM_RE = re.compile(r'^[^a-zA-Z0-9]+')
+
+
 def clean_song_title(song):
     """Strip any non-alpha or non-digit characters from the beginning of a song title."""
     if not song:
         return song
-    return re.sub(r'^[^a-zA-Z0-9]+', '', song).strip()
+    return LEADING_NON_ALNUM_RE.sub('', song).strip()
+
+
+# Track line classifier
+#
+# Each rule is (pattern, handler). Rules are tried once per line in order and
+# the first handler to return an (artist, song) pair wins. Handlers receive the
+# match, a callable returning the show-level artist (resolved at most once per
+# playlist) and the number of tracks parsed so far.
+
+TRAILING_DURATION_RE = re.compile(r'\s+\d+:\d+\s*$')
+TRAILING_ALBUM_RE = re.compile(r'\s+from\s+.+$')
+
+
+def _artist_then_song(match, show_artist, track_count):
+    return match.group(1).strip(), clean_song_title(match.group(2))
+
+
+def _song_then_artist(match, show_artist, track_count):
+    return match.group(2).strip(), clean_song_title(match.group(1))
+
+
+def _show_artist_song(match, show_artist, track_count):
+    # Single-artist shows list only the song; the artist comes from the title/description
+    return show_artist(), clean_song_title(match.group(1))
+
+
+def _quoted_song(match, show_artist, track_count):
+    # Strip any trailing track duration (e.g., "4:10") that might have been included
+    song = TRAILING_DURATION_RE.sub('', clean_song_title(match.group(1))).strip()
+    return show_artist(), song
+
+
+def _artist_dash_song(match, show_artist, track_count):
+    # Remove " from " and album info if present
+    song = TRAILING_ALBUM_RE.sub('', clean_song_title(match.group(2))).strip()
+    return match.group(1).strip(), song
+
+
+def _best_of_album(match, show_artist, track_count):
+    if track_count >= 20:  # Only likely a best-of album list near the top
+        return None
+    return match.group(1).strip(), clean_song_title(match.group(2))
+
+
+TRACK_LINE_RULES = [
+    # Pattern 0: Artist: "Song" (colon separator with quotes)
+    (re.compile(r'^(.+?):\s*["“](.+?)["”]'), _artist_then_song),
+    # Pattern 1: Artist - "Song"
+    (re.compile(r'^(.+?)\s*[-–—]\s*["“](.+?)["”]'), _artist_then_song),
+    # Pattern 1b: "Song" - Artist (reversed format)
+    (re.compile(r'^["“](.+?)["”]\s*[-–—]\s*(.+)$'), _song_then_artist),
+    # Pattern 1c: - "Song" (leading dash without artist, for continuation lists)
+    (re.compile(r'^[-–—]\s*["“](.+?)["”]\s*$'), _show_artist_song),
+    # Pattern 2: "Song" from Album (for artist-themed shows)
+    (re.compile(r'^["“](.+?)["”]\s+from\s+(.+)$'), _show_artist_song),
+    # Pattern 3: Just "Song" (for artist-themed shows like Prince)
+    # Also handles "Song" (with collaborator) format
+    # IMPORTANT: Check this BEFORE Pattern 4 (Artist - Song) to avoid misinterpreting
+    # dashes within quoted song titles (e.g., "Ghost Train Four-Oh-Ten")
+    (re.compile(r'^["“](.+?)["”](?:\s*\(.*\))?\s*(?:\d+:\d+)?\s*$'), _quoted_song),
+    # Pattern 4: Artist - Song (no quotes)
+    (re.compile(r'^(.+?)\s*[-–—]\s*(.+?)(?:\s+from\s+.+)?$'), _artist_dash_song),
+    # Pattern 5: Artist, Album (year-end best-of lists)
+    (re.compile(r'^(.+?),\s+(.+)$'), _best_of_album),
+    # Pattern 6: Artist [multiple spaces] Song (whitespace-separated format)
+    # Match lines with 5+ consecutive spaces separating artist and song
+    (re.compile(r'^([A-Z][a-zA-Z\s\.&]+?)\s{5,}(.+)$'), _artist_then_song),
+]
+
+TRACK_INDICATORS = ('-', '–', '—', '"', '“', '”', ', ')
+LIST_NUMBER_RE = re.compile(r'^\d+\.\s*')
+
+
+def classify_track_line(line, show_artist, track_count):
+    """
+    Classify a single track line into an (artist, song) pair.
+    Returns None for lines that are not tracks.
+    """
+    for pattern, handler in TRACK_LINE_RULES:
+        match = pattern.match(line)
+        if match:
+            result = handler(match, show_artist, track_count)
+            if result is not None:
+                return result
+
+    # Pattern 7: Just song title (no quotes, no artist - for artist-themed shows)
+    # This catches simple song titles that don't match any other pattern
+    if line and not line.startswith('By ') and len(line) > 3:
+        # Skip lines that are likely photo credits or standalone artist names
+        # These are short lines with no track indicators (dashes, quotes, commas, "from")
+        if len(line) < 30:
+            has_track_indicators = (
+                any(indicator in line for indicator in TRACK_INDICATORS) or
+                ' from ' in line.lower()
+            )
+            if not has_track_indicators:
+                return None
+
+        return show_artist(), clean_song_title(line)
+
+    return None
+
+
+TITLE_DASH_RE = re.compile(r'\s*[-–—]\s*')
+SIMPLE_ALBUM_LINE_RE = re.compile(r'^[^,]+,\s+.+$')
+TRACK_MARKERS = (
+    'track list:', 'track list',
+    'tracks:', 'tracks list:', 'tracks',
+    'tracklist:', 'tracklist',
+    'playlist:', 'playlist'
+)
+METADATA_LINES = frozenset(['Cyprus Avenue', 'Tweet', 'Share', 'Google+', 'Email', ''])
 
 
 def parse_playlist_file(filepath):
@@ -99,21 +231,12 @@ def parse_playlist_file(filepath):
     title = lines[0].strip() if lines else ""
     
     # Ensure any dash in the title has a space on either side
-    title = re.sub(r'\s*[-–—]\s*', ' - ', title)
+    title = TITLE_DASH_RE.sub(' - ', title)
 
     # Extract description - typically appears after metadata and before track list
     description = ""
-    description_started = False
     track_list_started = False
 
-    # Look for common track list markers (case insensitive check)
-    track_markers = [
-        'track list:', 'track list',
-        'tracks:', 'tracks list:', 'tracks',
-        'tracklist:', 'tracklist',
-        'playlist:', 'playlist'
-    ]
-
     description_lines = []
     track_lines = []
 
@@ -123,279 +246,498 @@ def parse_playlist_file(filepath):
     if len(lines) > 2:
         # Check if lines 2-5 all match "Artist, Album" pattern
         sample_lines = [l.strip() for l in lines[2:min(7, len(lines))] if l.strip() and not l.strip().startswith('By ')]
-        if sample_lines and all(re.match(r'^[^,]+,\s+.+$', line) for line in sample_lines):
+        if sample_lines and all(SIMPLE_ALBUM_LINE_RE.match(line) for line in sample_lines):
             is_simple_album_list = True
             track_list_started = True
 
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
+    for i, raw_line in enumerate(lines):
+        line = raw_line.strip()
 
         # Skip title, metadata, and empty lines at the start
-        if i == 0 or line.startswith('By ') or line in ['Cyprus Avenue', 'Tweet', 'Share', 'Google+', 'Email', '']:
-            i += 1
+        if i == 0 or line.startswith('By ') or line in METADATA_LINES:
             continue
 
         # For simple album lists, everything after title is tracks
-        if is_simple_album_list and line:
+        if is_simple_album_list:
             track_lines.append(line)
-            i += 1
             continue
 
         # Check if we've hit the track list section (case insensitive)
-        if any(marker in line.lower() for marker in track_markers):
+        line_lower = line.lower()
+        if any(marker in line_lower for marker in TRACK_MARKERS):
             track_list_started = True
-            i += 1
             continue
 
         # If we're in track list section, collect tracks
         if track_list_started:
             track_lines.append(line)
         # Otherwise, collect description
-        elif not track_list_started and line and not line.startswith('CREDIT'):
+        elif not line.startswith('CREDIT'):
             description_lines.append(line)
 
-        i += 1
-
     description = ' '.join(description_lines).strip()
 
+    # Resolve the show-level artist at most once, and only if a line needs it
+    show_artist_cache = []
+
+    def show_artist():
+        if not show_artist_cache:
+            show_artist_cache.append(extract_artist_from_title_and_description(title, description))
+        return show_artist_cache[0]
+
     # Parse tracks
     tracks = []
     for line in track_lines:
-        line = line.strip()
-
         # Skip empty lines, credits, and section headers
         if not line or line.startswith('CREDIT') or line.startswith('Credit') or 'FLICKR' in line:
             continue
 
         # Strip leading numbers from numbered lists (e.g., "1. Artist, Album" -> "Artist, Album")
-        line = re.sub(r'^\d+\.\s*', '', line)
+        line = LIST_NUMBER_RE.sub('', line)
 
-        # Try to parse artist - song patterns
-        # Pattern 0: Artist: "Song" (colon separator with quotes)
-        match = re.match(r'^(.+?):\s*["\u201c](.+?)["\u201d]', line)
-        if match:
-            artist = match.group(1).strip()
-            song = clean_song_title(match.group(2))
+        result = classify_track_line(line, show_artist, len(tracks))
+        if result is not None:
+            artist, song = result
             tracks.append({"artist": artist, "song": song})
-            continue
 
-        # Pattern 1: Artist - "Song"
-        match = re.match(r'^(.+?)\s*[-–—]\s*["\u201c](.+?)["\u201d]', line)
-        if match:
-            artist = match.group(1).strip()
-            song = clean_song_title(match.group(2))
-            tracks.append({"artist": artist, "song": song})
-            continue
+    # Get date from filename
+    filename = os.path.basename(filepath)
+    date = extract_date_from_filename(filename)
 
-        # Pattern 1b: "Song" - Artist (reversed format)
-        match = re.match(r'^["\u201c](.+?)["\u201d]\s*[-–—]\s*(.+)$', line)
-        if match:
-            song = clean_song_title(match.group(1))
-            artist = match.group(2).strip()
-            tracks.append({"artist": artist, "song": song})
-            continue
+    # Build the playlist object
+    playlist = {
+        "date": date,
+        "title": title,
+        "description": description,
+        "tracks": canonicalize_tracks(tracks),
+        "source_url": f"https://www.kcur.org/tags/cyprus-avenue",  # Generic for now
+        "archived_date": datetime.now().strftime("%Y-%m-%d")
+    }
 
-        # Pattern 1c: - "Song" (leading dash without artist, for continuation lists)
-        match = re.match(r'^[-–—]\s*["\u201c](.+?)["\u201d]\s*$', line)
-        if match:
-            song = clean_song_title(match.group(1))
-            # Extract artist from title/description for single-artist shows
-            artist = extract_artist_from_title_and_description(title, description)
-            tracks.append({"artist": artist, "song": song})
-            continue
+    return playlist
 
-        # Pattern 2: "Song" from Album (for artist-themed shows)
-        match = re.match(r'^["\u201c](.+?)["\u201d]\s+from\s+(.+)$', line)
-        if match:
-            song = clean_song_title(match.group(1))
-            album = match.group(2).strip()
-            # Extract artist from title/description for single-artist shows
-            artist = extract_artist_from_title_and_description(title, description)
-            tracks.append({"artist": artist, "song": song})
-            continue
 
-        # Pattern 3: Just "Song" (for artist-themed shows like Prince)
-        # Also handles "Song" (with collaborator) format
-        # IMPORTANT: Check this BEFORE Pattern 4 (Artist - Song) to avoid misinterpreting
-        # dashes within quoted song titles (e.g., "Ghost Train Four-Oh-Ten")
-        match = re.match(r'^["\u201c](.+?)["\u201d](?:\s*\(.*\))?\s*(?:\d+:\d+)?\s*$', line)
-        if match:
-            song = clean_song_title(match.group(1))
-            # Strip any trailing track duration (e.g., "4:10") that might have been included
-            song = re.sub(r'\s+\d+:\d+\s*$', '', song).strip()
-            # Extract artist from title/description for single-artist shows
-            artist = extract_artist_from_title_and_description(title, description)
-            tracks.append({"artist": artist, "song": song})
-            continue
+@lru_cache(maxsize=None)
+def parser_fingerprint():
+    """Hash of this parser's source and the artist alias table, so any rule change invalidates the cache"""
+    source = Path(__file__).read_bytes() + aliases_fingerprint().encode('ascii')
+    return hashlib.sha256(source).hexdigest()[:16]
 
-        # Pattern 4: Artist - Song (no quotes)
-        match = re.match(r'^(.+?)\s*[-–—]\s*(.+?)(?:\s+from\s+.+)?$', line)
-        if match:
-            artist = match.group(1).strip()
-            song = clean_song_title(match.group(2))
-            # Remove " from " and album info if present
-            song = re.sub(r'\s+from\s+.+$', '', song).strip()
-            tracks.append({"artist": artist, "song": song})
-            continue
 
-        # Pattern 5: Artist, Album (year-end best-of lists)
-        match = re.match(r'^(.+?),\s+(.+)$', line)
-        if match and len(tracks) < 20:  # Likely a best-of album list
-            artist = match.group(1).strip()
-            album = clean_song_title(match.group(2))
-            tracks.append({"artist": artist, "song": album})
-            continue
+def file_digest(filepath):
+    """SHA-256 of a file's contents"""
+    return hashlib.sha256(Path(filepath).read_bytes()).hexdigest()
 
-        # Pattern 6: Artist [multiple spaces] Song (whitespace-separated format)
-        # Match lines with 5+ consecutive spaces separating artist and song
-        match = re.match(r'^([A-Z][a-zA-Z\s\.&]+?)\s{5,}(.+)$', line)
-        if match:
-            artist = match.group(1).strip()
-            song = clean_song_title(match.group(2))
-            tracks.append({"artist": artist, "song": song})
-            continue
 
-        # Pattern 7: Just song title (no quotes, no artist - for artist-themed shows)
-        # This catches simple song titles that don't match any other pattern
-        if line and not line.startswith('By ') and len(line) > 3:
-            # Skip lines that are likely photo credits or standalone artist names
-            # These are short lines with no track indicators (dashes, quotes, commas, "from")
-            has_track_indicators = (
-                '-' in line or '–' in line or '—' in line or  # dashes
-                '"' in line or '\u201c' in line or '\u201d' in line or  # quotes
-                ', ' in line or  # comma-space (Artist, Album pattern)
-                ' from ' in line.lower()  # "from" keyword
-            )
+def load_parse_cache(cache_path):
+    """Load the parse cache entries, discarding them if the parser has changed"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
 
-            # If line is short (<30 chars) and has no track indicators, skip it
-            # This filters out standalone names like "Sam Baker" that are photo credits
-            if len(line) < 30 and not has_track_indicators:
-                continue
+    if cache.get('parser_version') != parser_fingerprint():
+        print("Parser changed since last run, ignoring parse cache")
+        return {}
+    return cache.get('files', {})
 
-            # Extract artist from title/description for single-artist shows
-            artist = extract_artist_from_title_and_description(title, description)
-            tracks.append({"artist": artist, "song": clean_song_title(line)})
-            continue
 
+def save_parse_cache(cache_path, entries):
+    """Atomically write the parse cache"""
+    write_json_atomic({'parser_version': parser_fingerprint(), 'files': entries}, cache_path, compact=True)
 
-    # Get date from filename
-    filename = os.path.basename(filepath)
-    date = extract_date_from_filename(filename)
 
-    # Build the playlist object
-    playlist = {
-        "date": date,
-        "title": title,
-        "description": description,
-        "tracks": tracks,
-        "source_url": f"https://www.kcur.org/tags/cyprus-avenue",  # Generic for now
-        "archived_date": datetime.now().strftime("%Y-%m-%d")
-    }
+def _parse_file_result(txt_file):
+    """Parse one file, returning (playlist, error) so failures survive a process pool"""
+    try:
+        return parse_playlist_file(txt_file), None
+    except Exception as e:
+        return None, e
+
+
+def iter_parsed_files(txt_files, jobs=1):
+    """
+    Yield (txt_file, playlist, error) for each file, in input order.
+    With jobs > 1 the files are parsed across a process pool.
+    """
+    if jobs > 1 and len(txt_files) > 1:
+        chunksize = max(1, len(txt_files) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = executor.map(_parse_file_result, txt_files, chunksize=chunksize)
+            for txt_file, (playlist, error) in zip(txt_files, results):
+                yield txt_file, playlist, error
+    else:
+        for txt_file in txt_files:
+            playlist, error = _parse_file_result(txt_file)
+            yield txt_file, playlist, error
 
+
+def playlist_sort_key(playlist):
+    """Sort key for playlists: by date, undated first"""
+    return playlist['date'] if playlist['date'] else '0000-00-00'
+
+
+def canonicalize_preserved(playlist, json_file):
+    """Apply the artist alias table to a playlist without a txt source, rewriting its file if it changed"""
+    tracks = canonicalize_tracks(playlist.get('tracks', []))
+    if tracks == playlist.get('tracks'):
+        return playlist
+
+    playlist = dict(playlist, tracks=tracks)
+    write_json_atomic(playlist, json_file)
     return playlist
 
 
-def parse_all_playlists(txt_dir, output_dir):
-    """Parse all playlist files and convert to JSON"""
+def iter_all_playlists(txt_dir, output_dir, cache_path=PARSE_CACHE_PATH, jobs=1):
+    """
+    Parse all playlist files and yield them one at a time, sorted by date.
+    Files whose content hash matches the parse cache are not re-parsed;
+    pass cache_path=None to force a full re-parse. Changed files are
+    parsed across `jobs` worker processes.
+    """
     txt_path = Path(txt_dir)
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    all_playlists = []
-
-    # Get all .txt files
-    txt_files = sorted(txt_path.glob('*.txt'))
+    # Get all .txt files, in the order their playlists sort
+    txt_files = sorted(txt_path.glob('*.txt'),
+                       key=lambda f: (extract_date_from_filename(f.name) or '0000-00-00', f.name))
 
     print(f"Found {len(txt_files)} playlist files to parse...")
 
     # Track which JSON files we're creating from txt
-    parsed_json_files = set()
+    parsed_json_files = {txt_file.stem + '.json' for txt_file in txt_files}
+
+    # Load any existing JSON files that don't have txt sources
+    # (These are playlists fetched from KCUR or manually created)
+    preserved_playlists = []
+    for json_file in sorted(output_path.glob('*.json')):
+        if json_file.name not in parsed_json_files:
+            try:
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    playlist = json.load(f)
+                preserved_playlists.append(canonicalize_preserved(playlist, json_file))
+            except Exception as e:
+                print(f"⚠️  Warning: Could not load {json_file.name}: {e}")
+
+    if preserved_playlists:
+        print(f"✓ Preserving {len(preserved_playlists)} existing JSON files without txt sources")
+    preserved_playlists.sort(key=playlist_sort_key)
+
+    # Both streams are already in date order, so merging keeps the output sorted
+    # without holding every parsed playlist in memory
+    parsed_playlists = _iter_parsed_playlists(txt_files, output_path, cache_path, jobs)
+    yield from heapq.merge(parsed_playlists, preserved_playlists, key=playlist_sort_key)
+
+
+def _output_entry(json_file, cached=None):
+    """Digest, size and mtime of an individual JSON file, re-hashing it only if its size/mtime changed"""
+    stat = json_file.stat()
+    if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+        return cached
+    return {'sha256': file_digest(json_file), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _iter_parsed_playlists(txt_files, output_path, cache_path, jobs):
+    """
+    Yield playlists for txt_files in order, using the parse cache where possible.
+    The cache only holds digests: a cached playlist is read back from its
+    individual JSON file, which is regenerated if it no longer matches the
+    digest recorded when it was written.
+    """
+    cache = load_parse_cache(cache_path) if cache_path else {}
+    new_cache = {}
+    reused_count = 0
+
+    # Work out which files changed since they were cached
+    entries_by_file = {}
+    to_parse = []
 
     for txt_file in txt_files:
         try:
-            print(f"Parsing {txt_file.name}...", end=' ')
-            playlist = parse_playlist_file(txt_file)
+            # Only hash files whose size/mtime changed since they were cached
+            stat = txt_file.stat()
+            cached = cache.get(txt_file.name)
+            if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+                digest = cached['sha256']
+            else:
+                digest = file_digest(txt_file)
+
+            entry = {'sha256': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            if cached and cached['sha256'] == digest and cached.get('output'):
+                json_filepath = output_path / (txt_file.stem + '.json')
+                if not json_filepath.exists():
+                    print(f"⚠️  {json_filepath.name} is missing, regenerating it")
+                else:
+                    output = _output_entry(json_filepath, cached['output'])
+                    if output['sha256'] == cached['output']['sha256']:
+                        entry['output'] = output
+                    else:
+                        print(f"⚠️  {json_filepath.name} was changed outside the parser, regenerating it")
+            if 'output' not in entry:
+                to_parse.append(txt_file)
+            entries_by_file[txt_file] = entry
 
-            # Save individual JSON file
-            json_filename = txt_file.stem + '.json'
-            json_filepath = output_path / json_filename
-            parsed_json_files.add(json_filename)
+        except Exception as e:
+            print(f"✗ Error in {txt_file.name}: {e}")
 
-            with open(json_filepath, 'w', encoding='utf-8') as f:
-                json.dump(playlist, f, indent=2, ensure_ascii=False)
+    # Parse new and edited files, yielding everything in txt file order
+    parsed = iter_parsed_files(to_parse, jobs)
 
-            all_playlists.append(playlist)
-            print(f"✓ ({len(playlist['tracks'])} tracks)")
+    for txt_file in txt_files:
+        entry = entries_by_file.get(txt_file)
+        if entry is None:
+            continue
 
-        except Exception as e:
-            print(f"✗ Error: {e}")
+        json_filepath = output_path / (txt_file.stem + '.json')
 
-    # Load any existing JSON files that don't have txt sources
-    # (These are playlists fetched from KCUR or manually created)
-    existing_json_files = sorted(output_path.glob('*.json'))
-    preserved_count = 0
+        if 'output' in entry:
+            with open(json_filepath, 'r', encoding='utf-8') as f:
+                playlist = json.load(f)
+            reused_count += 1
+        else:
+            _, playlist, error = next(parsed)
+            print(f"Parsing {txt_file.name}...", end=' ')
+            if error is not None:
+                print(f"✗ Error: {error}")
+                continue
 
-    for json_file in existing_json_files:
-        if json_file.name not in parsed_json_files:
             try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    playlist = json.load(f)
-                    all_playlists.append(playlist)
-                    preserved_count += 1
+                # Save individual JSON file
+                write_json_atomic(playlist, json_filepath)
+                entry['output'] = _output_entry(json_filepath)
             except Exception as e:
-                print(f"⚠️  Warning: Could not load {json_file.name}: {e}")
-
-    if preserved_count > 0:
-        print(f"\n✓ Preserved {preserved_count} existing JSON files without txt sources")
+                print(f"✗ Error: {e}")
+                continue
 
-    # Sort all playlists by date
-    all_playlists.sort(key=lambda x: x['date'] if x['date'] else '0000-00-00')
+            print(f"✓ ({len(playlist['tracks'])} tracks)")
 
-    return all_playlists
+        new_cache[txt_file.name] = entry
+        yield playlist
+
+    if cache_path:
+        save_parse_cache(cache_path, new_cache)
+        if reused_count > 0:
+            print(f"✓ Reused {reused_count} unchanged playlists from parse cache")
+
+
+def parse_all_playlists(txt_dir, output_dir, cache_path=PARSE_CACHE_PATH, jobs=1):
+    """Parse all playlist files and convert to JSON, returning a date-sorted list"""
+    return list(iter_all_playlists(txt_dir, output_dir, cache_path=cache_path, jobs=jobs))
+
+
+def write_playlists(playlists, output_file, fmt='json'):
+    """
+    Stream playlists to output_file as they are produced.
+    fmt='json' writes the same pretty-printed array as json.dump(..., indent=2);
+    fmt='jsonl' writes one compact playlist per line. The file is written
+    to a temporary path and moved into place, so readers never see a partial file.
+    Returns the number of playlists written.
+    """
+    output_file = Path(output_file)
+    tmp_file = output_file.with_name(output_file.name + '.tmp')
+    count = 0
+
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        for playlist in playlists:
+            if fmt == 'jsonl':
+                f.write(json.dumps(playlist, ensure_ascii=False, separators=(',', ':')))
+                f.write('\n')
+            else:
+                f.write('[\n  ' if count == 0 else ',\n  ')
+                f.write(json.dumps(playlist, indent=2, ensure_ascii=False).replace('\n', '\n  '))
+            count += 1
+
+        if fmt != 'jsonl':
+            f.write('\n]' if count else '[]')
+
+    os.replace(tmp_file, output_file)
+    return count
+
+
+def shard_name(playlist):
+    """Shard a playlist belongs to: its year, or 'undated'"""
+    return playlist['date'][:4] if playlist['date'] else 'undated'
+
+
+def iter_year_shards(playlists, shard_dir, shard_index):
+    """
+    Pass date-sorted playlists through unchanged while writing each year to
+    {shard_dir}/{year}.json, filling shard_index with per-shard details and
+    a {date, title, track_count, shard} entry per playlist. Only one year's
+    playlists are held in memory at a time.
+    """
+    shard_dir = Path(shard_dir)
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    shard_index.update(shards={}, playlists=[])
+
+    for name, group in groupby(playlists, key=shard_name):
+        shard_playlists = []
+        for playlist in group:
+            shard_playlists.append(playlist)
+            shard_index['playlists'].append({
+                'date': playlist['date'],
+                'title': playlist['title'],
+                'track_count': len(playlist['tracks']),
+                'shard': name,
+            })
+            yield playlist
+
+        shard_path = shard_dir / f"{name}.json"
+        write_playlists(shard_playlists, shard_path)
+        shard_index['shards'][name] = {
+            'file': shard_path.name,
+            'playlist_count': len(shard_playlists),
+            'bytes': shard_path.stat().st_size,
+        }
+
+
+def write_shard_index(shard_index, shard_dir):
+    """Write the compact shard index and remove shards left over from earlier runs"""
+    shard_dir = Path(shard_dir)
+    current = {info['file'] for info in shard_index['shards'].values()} | {SHARD_INDEX_NAME}
+    for stale in shard_dir.glob('*.json'):
+        if stale.name not in current:
+            stale.unlink()
+
+    write_json_atomic(shard_index, shard_dir / SHARD_INDEX_NAME, compact=True)
+
+
+def publish_file(source, destination):
+    """
+    Atomically copy source to destination. A copy rather than a hard link:
+    other tools (recover-missing-tracks.js) rewrite json/playlists.json in
+    place, which must not change the published copy behind its back.
+    """
+    destination = Path(destination)
+    tmp_file = destination.with_name(destination.name + '.tmp')
+    shutil.copyfile(source, tmp_file)
+    os.replace(tmp_file, destination)
 
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description='Parse Cyprus Avenue playlist text files into JSON')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore the parse cache and re-parse every file')
+    parser.add_argument('--cache', default=PARSE_CACHE_PATH,
+                        help=f'Parse cache location (default: {PARSE_CACHE_PATH})')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of worker processes for parsing (0 = one per CPU core)')
+    parser.add_argument('--format', choices=['json', 'jsonl'], default='json',
+                        help='Consolidated output format (default: json; the web app reads json)')
+    parser.add_argument('--validate', action='store_true',
+                        help='Validate each playlist as it is produced and print a quality report')
+    parser.add_argument('--db', default=DB_PATH,
+                        help=f'SQLite archive database to keep in sync (default: {DB_PATH})')
+    parser.add_argument('--no-db', action='store_true', help='Skip the SQLite archive database')
+    parser.add_argument('--shards', action='store_true',
+                        help=f'Also write one file per year plus a small index to {SHARD_DIR}/ (and web/public/shards/)')
+    parser.add_argument('--top', type=int, default=TOP_N,
+                        help=f'Entries per top-N table in {STATS_PATH} (default: {TOP_N})')
+    args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
     # Paths
     txt_dir = 'txt'
     individual_json_dir = 'json/individual'
-    consolidated_json_path = 'json/playlists.json'
-    web_public_path = 'web/public/playlists.json'
+    consolidated_json_path = f'json/playlists.{args.format}'
+    web_public_path = f'web/public/playlists.{args.format}'
+    web_shard_dir = 'web/public/shards'
+    web_stats_path = 'web/public/stats.json'
 
-    # Parse all playlists
-    all_playlists = parse_all_playlists(txt_dir, individual_json_dir)
+    digests = {}
 
-    # Create consolidated JSON
-    os.makedirs('json', exist_ok=True)
-    with open(consolidated_json_path, 'w', encoding='utf-8') as f:
-        json.dump(all_playlists, f, indent=2, ensure_ascii=False)
+    def tally(playlists):
+        for playlist in playlists:
+            if playlist['date']:
+                digests[playlist['date']] = playlist_digest(playlist)
+            yield playlist
 
-    # Copy to web/public for web app
+    # Parse all playlists and write the consolidated file in one pass
+    os.makedirs('json', exist_ok=True)
+    playlists = iter_all_playlists(txt_dir, individual_json_dir,
+                                   cache_path=None if args.no_cache else args.cache,
+                                   jobs=jobs)
+    if args.validate:
+        report = new_report()
+        playlists = iter_validated(playlists, report)
+    if args.shards:
+        shard_index = {}
+        playlists = iter_year_shards(playlists, SHARD_DIR, shard_index)
+    if not args.no_db:
+        db_stats = {}
+        playlists = iter_db_sync(playlists, args.db, db_stats)
+    track_table = {}
+    playlists = iter_track_keys(playlists, track_table)
+    stats = new_stats()
+    playlists = iter_stats(playlists, stats)
+    consolidated_count = write_playlists(tally(playlists), consolidated_json_path, fmt=args.format)
+
+    consolidated_sha256 = bytes_digest(consolidated_json_path)
+    manifest_files = {'consolidated': {'path': consolidated_json_path, 'sha256': consolidated_sha256}}
+
+    # Publish the already-serialized file to web/public for the web app
     web_public_dir = os.path.dirname(web_public_path)
     if os.path.exists(web_public_dir):
-        with open(web_public_path, 'w', encoding='utf-8') as f:
-            json.dump(all_playlists, f, indent=2, ensure_ascii=False)
+        publish_file(consolidated_json_path, web_public_path)
+        manifest_files['web'] = {'path': web_public_path, 'sha256': consolidated_sha256}
         print(f"✓ Copied to web app: {web_public_path}")
     else:
         print(f"⚠️  Warning: {web_public_dir} not found, skipping web app copy")
 
+    stats_document = build_stats(stats, args.top)
+    write_json_atomic(stats_document, STATS_PATH)
+    print(f"✓ Wrote {STATS_PATH} ({stats_document['totals']['unique_artists']} artists, "
+          f"{len(stats_document['years'])} years)")
+    if os.path.exists(web_public_dir):
+        publish_file(STATS_PATH, web_stats_path)
+
+    delta_count = write_track_keys(track_table)
+    print(f"✓ Wrote {len(track_table)} unique track keys ({delta_count} awaiting Spotify indexing)")
+
+    if not args.no_db:
+        print(f"✓ Synced {args.db}: {db_stats['written']} written, {db_stats['unchanged']} unchanged, "
+              f"{db_stats['removed']} removed")
+
+    if args.shards:
+        write_shard_index(shard_index, SHARD_DIR)
+        print(f"✓ Wrote {len(shard_index['shards'])} year shards to {SHARD_DIR}/")
+        if os.path.exists(web_public_dir):
+            os.makedirs(web_shard_dir, exist_ok=True)
+            for stale in Path(web_shard_dir).glob('*.json'):
+                if not (Path(SHARD_DIR) / stale.name).exists():
+                    stale.unlink()
+            for shard_file in sorted(Path(SHARD_DIR).glob('*.json')):
+                publish_file(shard_file, Path(web_shard_dir) / shard_file.name)
+            print(f"✓ Copied shards to web app: {web_shard_dir}/")
+
+    # Record digests so the validator can check every copy agrees
+    write_manifest(build_manifest(digests, manifest_files), MANIFEST_PATH)
+
+    # Re-index the individual files that were just written
+    refresh_archive_index(individual_json_dir)
+
     # Print summary
     print(f"\n{'='*60}")
     print(f"Parsing complete!")
     print(f"{'='*60}")
-    print(f"Total playlists parsed: {len(all_playlists)}")
+    totals = stats_document['totals']
+    print(f"Total playlists parsed: {totals['playlists']}")
     print(f"Individual JSON files: {individual_json_dir}/")
     print(f"Consolidated JSON: {consolidated_json_path}")
 
-    # Calculate some stats
-    total_tracks = sum(len(p['tracks']) for p in all_playlists)
-    avg_tracks = total_tracks / len(all_playlists) if all_playlists else 0
+    print(f"\nStatistics ({STATS_PATH}):")
+    print(f"  Total tracks: {totals['tracks']}")
+    print(f"  Average tracks per show: {totals['average_tracks_per_show']:.1f}")
+    print(f"  Unique artists: {totals['unique_artists']}")
+    print(f"  Date range: {totals['first_date']} to {totals['last_date']}")
 
-    print(f"\nStatistics:")
-    print(f"  Total tracks: {total_tracks}")
-    print(f"  Average tracks per show: {avg_tracks:.1f}")
-    print(f"  Date range: {all_playlists[0]['date']} to {all_playlists[-1]['date']}")
+    if args.validate:
+        finish_report(report, consolidated_count)
+        write_clusters(report['clusters']['artists'], report['clusters']['tracks'])
+        print_report(report)
 
 
 if __name__ == '__main__':
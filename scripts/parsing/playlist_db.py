@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+SQLite archive database built alongside the JSON output.
+
+Normalizes the playlists into playlists, artists and tracks tables, with
+FTS5 indexes over playlist titles/descriptions and track artists/songs, so
+search-heavy consumers get indexed lookups instead of scanning
+playlists.json. The parser keeps it in sync incrementally: each playlist
+row stores its digest, and only dates whose digest changed are rewritten.
+
+Artists are keyed by the canonical artist_id, so spelling variants share
+one row and aggregate together; tracks keep the artist name as printed.
+
+Run this file to search the database from the command line.
+"""
+
+import argparse
+import json
+import sqlite3
+
+from playlist_manifest import playlist_digest
+
+
+DB_PATH = 'json/playlists.db'
+
+# Bumped when the layout changes; older databases are dropped and rebuilt by the next sync
+SCHEMA_VERSION = 2
+
+DROP_SCHEMA = """
+DROP TABLE IF EXISTS tracks_fts;
+DROP TABLE IF EXISTS playlists_fts;
+DROP TABLE IF EXISTS tracks;
+DROP TABLE IF EXISTS artists;
+DROP TABLE IF EXISTS playlists;
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS playlists (
+    date TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    source_url TEXT,
+    archived_date TEXT,
+    track_count INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS artists (
+    artist_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tracks (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL REFERENCES playlists(date) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    artist TEXT NOT NULL,
+    artist_id TEXT REFERENCES artists(artist_id),
+    canonical_artist TEXT,
+    song TEXT NOT NULL,
+    extra TEXT
+);
+
+CREATE INDEX IF NOT EXISTS tracks_date ON tracks(date);
+CREATE INDEX IF NOT EXISTS tracks_artist ON tracks(artist_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS playlists_fts USING fts5(
+    title, description, content='playlists', content_rowid='rowid'
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS tracks_fts USING fts5(artist, song);
+"""
+
+
+def connect(db_path=DB_PATH):
+    """Open the database, creating the schema if needed"""
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA foreign_keys = ON')
+    if conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+        conn.executescript(DROP_SCHEMA)
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _add_artist(conn, track, artist_ids):
+    """Insert the artist row for a track's artist_id if it is new"""
+    artist_id = track.get('artist_id')
+    if artist_id and artist_id not in artist_ids:
+        conn.execute('INSERT OR IGNORE INTO artists (artist_id, name) VALUES (?, ?)',
+                     (artist_id, track.get('canonical_artist') or track['artist']))
+        artist_ids.add(artist_id)
+
+
+def _refresh_artists(conn):
+    """Drop artists without tracks and name the rest after their most played spelling"""
+    conn.execute('DELETE FROM artists WHERE artist_id NOT IN '
+                 '(SELECT DISTINCT artist_id FROM tracks WHERE artist_id IS NOT NULL)')
+    conn.execute(
+        'UPDATE artists SET name = ('
+        'SELECT COALESCE(canonical_artist, artist) AS spelling FROM tracks '
+        'WHERE tracks.artist_id = artists.artist_id '
+        'GROUP BY spelling ORDER BY COUNT(*) DESC, spelling LIMIT 1)')
+
+
+def _delete_playlist(conn, date):
+    """Remove a playlist, its tracks and their search entries"""
+    row = conn.execute('SELECT rowid, title, description FROM playlists WHERE date = ?', (date,)).fetchone()
+    if row is None:
+        return
+    conn.execute("INSERT INTO playlists_fts (playlists_fts, rowid, title, description) VALUES ('delete', ?, ?, ?)",
+                 row)
+    conn.execute('DELETE FROM tracks_fts WHERE rowid IN (SELECT id FROM tracks WHERE date = ?)', (date,))
+    conn.execute('DELETE FROM playlists WHERE date = ?', (date,))
+
+
+def _insert_playlist(conn, playlist, digest, artist_ids):
+    """Insert a playlist with its tracks and search entries"""
+    cursor = conn.execute(
+        'INSERT INTO playlists (date, title, description, source_url, archived_date, track_count, digest) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+        (playlist['date'], playlist['title'], playlist.get('description') or '',
+         playlist.get('source_url'), playlist.get('archived_date'), len(playlist['tracks']), digest))
+    conn.execute('INSERT INTO playlists_fts (rowid, title, description) VALUES (?, ?, ?)',
+                 (cursor.lastrowid, playlist['title'], playlist.get('description') or ''))
+
+    for position, track in enumerate(playlist['tracks'], 1):
+        _add_artist(conn, track, artist_ids)
+        extra = {k: v for k, v in track.items() if k not in ('artist', 'artist_id', 'canonical_artist', 'song')}
+        cursor = conn.execute(
+            'INSERT INTO tracks (date, position, artist, artist_id, canonical_artist, song, extra) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (playlist['date'], position, track['artist'], track.get('artist_id'), track.get('canonical_artist'),
+             track['song'], json.dumps(extra, ensure_ascii=False) if extra else None))
+        conn.execute('INSERT INTO tracks_fts (rowid, artist, song) VALUES (?, ?, ?)',
+                     (cursor.lastrowid, track['artist'], track['song']))
+
+
+def iter_db_sync(playlists, db_path, stats):
+    """
+    Pass playlists through unchanged while syncing them into the database.
+    Dated playlists whose digest differs from their row are rewritten;
+    rows for dates no longer produced are removed once the stream ends.
+    stats receives 'written', 'unchanged' and 'removed' counts.
+    """
+    conn = connect(db_path)
+    stored = dict(conn.execute('SELECT date, digest FROM playlists'))
+    artist_ids = {artist_id for artist_id, in conn.execute('SELECT artist_id FROM artists')}
+    seen = set()
+    stats.update(written=0, unchanged=0, removed=0)
+
+    try:
+        with conn:
+            for playlist in playlists:
+                date = playlist['date']
+                if date and date not in seen:
+                    seen.add(date)
+                    digest = playlist_digest(playlist)
+                    if stored.get(date) == digest:
+                        stats['unchanged'] += 1
+                    else:
+                        _delete_playlist(conn, date)
+                        _insert_playlist(conn, playlist, digest, artist_ids)
+                        stats['written'] += 1
+                yield playlist
+
+            for date in stored.keys() - seen:
+                _delete_playlist(conn, date)
+                stats['removed'] += 1
+            if stats['written'] or stats['removed']:
+                _refresh_artists(conn)
+    finally:
+        conn.close()
+
+
+def search_tracks(conn, query, limit=20):
+    """(date, title, artist, song) for tracks matching an FTS5 query, best matches first"""
+    return conn.execute(
+        'SELECT t.date, p.title, t.artist, t.song FROM tracks_fts '
+        'JOIN tracks t ON t.id = tracks_fts.rowid '
+        'JOIN playlists p ON p.date = t.date '
+        'WHERE tracks_fts MATCH ? ORDER BY rank LIMIT ?', (query, limit)).fetchall()
+
+
+def search_playlists(conn, query, limit=20):
+    """(date, title, track count) for playlists whose title/description match an FTS5 query"""
+    return conn.execute(
+        'SELECT p.date, p.title, p.track_count FROM playlists_fts '
+        'JOIN playlists p ON p.rowid = playlists_fts.rowid '
+        'WHERE playlists_fts MATCH ? ORDER BY rank LIMIT ?', (query, limit)).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Search the playlist archive database')
+    parser.add_argument('query', help='FTS5 query, e.g. "van morrison" or artist:dylan')
+    parser.add_argument('--db', default=DB_PATH, help=f'Database path (default: {DB_PATH})')
+    parser.add_argument('--playlists', action='store_true', help='Search playlist titles/descriptions instead of tracks')
+    parser.add_argument('--limit', type=int, default=20, help='Maximum results (default: 20)')
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    try:
+        if args.playlists:
+            for date, title, track_count in search_playlists(conn, args.query, args.limit):
+                print(f"{date}  {title} ({track_count} tracks)")
+        else:
+            for date, title, artist, song in search_tracks(conn, args.query, args.limit):
+                print(f"{date}  {artist} - {song}  [{title}]")
+    except sqlite3.OperationalError as e:
+        print(f"❌ Invalid search: {e}")
+        exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
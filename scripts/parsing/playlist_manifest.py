@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Digest manifest for parsed playlist data.
+
+The parser records a digest for every playlist plus a Merkle root over all
+of them, and the byte digests of the consolidated files. The validator can
+then confirm that json/individual/*.json, json/playlists.json and
+web/public/playlists.json agree by comparing digests, and name exactly
+which dates differ when they don't.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from json_io import write_json_atomic
+
+
+MANIFEST_PATH = 'json/manifest.json'
+
+
+def playlist_digest(playlist):
+    """Digest of a playlist's content, independent of file formatting"""
+    canonical = json.dumps(playlist, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def bytes_digest(path):
+    """SHA-256 of a file's bytes"""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def merkle_root(digests):
+    """Merkle root over a {date: digest} mapping, taken in date order"""
+    level = [hashlib.sha256(f"{date}:{digest}".encode('utf-8')).digest()
+             for date, digest in sorted(digests.items())]
+    if not level:
+        return hashlib.sha256(b'').hexdigest()
+
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [hashlib.sha256(level[i] + level[i + 1]).digest() for i in range(0, len(level), 2)]
+    return level[0].hex()
+
+
+def diff_digests(expected, actual):
+    """Sorted dates whose digests differ, or that appear on only one side"""
+    return sorted(date for date in expected.keys() | actual.keys()
+                  if expected.get(date) != actual.get(date))
+
+
+def build_manifest(digests, files):
+    """Manifest for {date: digest} playlists and {name: {'path', 'sha256'}} output files"""
+    return {
+        'root_digest': merkle_root(digests),
+        'playlist_count': len(digests),
+        'files': files,
+        'playlists': dict(sorted(digests.items())),
+    }
+
+
+def write_manifest(manifest, manifest_path=MANIFEST_PATH):
+    """Atomically write the manifest"""
+    write_json_atomic(manifest, manifest_path)
+
+
+def update_manifest(digests, files, manifest_path=MANIFEST_PATH, replace=False):
+    """
+    Fold {date: digest} and {name: {'path', 'sha256'}} into an existing
+    manifest, for tools that rewrite outputs outside the parser. With
+    replace, digests stands for every playlist instead of just the changed
+    ones. Returns False if there is no manifest to update.
+    """
+    manifest = load_manifest(manifest_path)
+    if manifest is None:
+        return False
+    if not replace:
+        digests = dict(manifest.get('playlists', {}), **digests)
+    write_manifest(build_manifest(digests, dict(manifest.get('files', {}), **files)), manifest_path)
+    return True
+
+
+def load_manifest(manifest_path=MANIFEST_PATH):
+    """Load the manifest, or None if it has not been written yet"""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
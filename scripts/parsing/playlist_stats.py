@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Aggregate archive statistics, built by the parser in the same pass.
+
+Artist play counts, per-year and per-month show/track counts, first and
+last appearances and top-N tables are computed once per build and written
+to json/stats.json (published to web/public/), so consumers don't rescan
+playlists.json on every request. Artists are grouped by artist_id, so
+spelling variants count as one act under their most used name.
+"""
+
+from collections import Counter, defaultdict
+
+
+STATS_PATH = 'json/stats.json'
+TOP_N = 25
+
+
+def new_stats():
+    """Empty accumulator, filled in by iter_stats()"""
+    return {
+        'playlists': 0,
+        'tracks': 0,
+        'first_date': None,
+        'last_date': None,
+        'years': defaultdict(lambda: {'shows': 0, 'tracks': 0}),
+        'months': defaultdict(lambda: {'shows': 0, 'tracks': 0}),
+        'artists': {},
+        'songs': {},
+    }
+
+
+def _count_air(entry, date):
+    """Update an entry's first/last air dates"""
+    if date:
+        if not entry['first_aired'] or date < entry['first_aired']:
+            entry['first_aired'] = date
+        if not entry['last_aired'] or date > entry['last_aired']:
+            entry['last_aired'] = date
+
+
+def iter_stats(playlists, stats):
+    """Pass playlists through unchanged while accumulating stats"""
+    for playlist in playlists:
+        date = playlist['date']
+        tracks = playlist['tracks']
+        stats['playlists'] += 1
+        stats['tracks'] += len(tracks)
+        if date:
+            if stats['first_date'] is None or date < stats['first_date']:
+                stats['first_date'] = date
+            if stats['last_date'] is None or date > stats['last_date']:
+                stats['last_date'] = date
+            for period in (stats['years'][date[:4]], stats['months'][date[:7]]):
+                period['shows'] += 1
+                period['tracks'] += len(tracks)
+
+        seen_in_show = set()
+        for track in tracks:
+            artist_id = track.get('artist_id')
+            if not artist_id:
+                continue
+
+            artist = stats['artists'].get(artist_id)
+            if artist is None:
+                artist = stats['artists'][artist_id] = {
+                    'names': Counter(), 'plays': 0, 'shows': 0, 'songs': set(),
+                    'first_aired': None, 'last_aired': None,
+                }
+            artist['names'][track.get('canonical_artist') or track['artist']] += 1
+            artist['plays'] += 1
+            artist['songs'].add(track['song'])
+            if artist_id not in seen_in_show:
+                seen_in_show.add(artist_id)
+                artist['shows'] += 1
+                _count_air(artist, date)
+
+            song_key = (artist_id, track['song'])
+            song = stats['songs'].get(song_key)
+            if song is None:
+                song = stats['songs'][song_key] = {'plays': 0, 'first_aired': None, 'last_aired': None}
+            song['plays'] += 1
+            _count_air(song, date)
+        yield playlist
+
+
+def build_stats(stats, top_n=TOP_N):
+    """JSON-ready stats document from a filled accumulator"""
+    artists = {}
+    for artist_id, entry in stats['artists'].items():
+        artists[artist_id] = {
+            'artist': entry['names'].most_common(1)[0][0],
+            'plays': entry['plays'],
+            'shows': entry['shows'],
+            'unique_songs': len(entry['songs']),
+            'first_aired': entry['first_aired'],
+            'last_aired': entry['last_aired'],
+        }
+    by_plays = sorted(artists, key=lambda a: (-artists[a]['plays'], a))
+    by_shows = sorted(artists, key=lambda a: (-artists[a]['shows'], -artists[a]['plays'], a))
+
+    top_songs = sorted(stats['songs'].items(), key=lambda item: (-item[1]['plays'], item[0]))[:top_n]
+
+    return {
+        'totals': {
+            'playlists': stats['playlists'],
+            'tracks': stats['tracks'],
+            'average_tracks_per_show': round(stats['tracks'] / stats['playlists'], 1) if stats['playlists'] else 0,
+            'unique_artists': len(artists),
+            'unique_tracks': len(stats['songs']),
+            'first_date': stats['first_date'],
+            'last_date': stats['last_date'],
+        },
+        'years': dict(sorted(stats['years'].items())),
+        'months': dict(sorted(stats['months'].items())),
+        'top': {
+            'artists_by_plays': [dict(artist_id=a, **artists[a]) for a in by_plays[:top_n]],
+            'artists_by_shows': [dict(artist_id=a, **artists[a]) for a in by_shows[:top_n]],
+            'tracks': [dict(artist=artists[artist_id]['artist'], artist_id=artist_id, song=song, **entry)
+                       for (artist_id, song), entry in top_songs],
+        },
+        'artists': {a: artists[a] for a in by_plays},
+    }
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Unique track-key table and delta feed for Spotify indexing.
+
+Tracks are keyed "Artist|Song", the same keys web/public/spotify-index.json
+uses. The parser writes every key with its occurrence count and first/last
+air dates, plus a delta of keys that are new since the previous build.
+The delta accumulates until the Spotify indexer consumes it
+(index-spotify.sh --delta), so several parser runs in between lose nothing.
+"""
+
+import json
+
+from json_io import write_json_atomic
+
+
+TRACK_KEYS_PATH = 'json/track_keys.json'
+TRACK_DELTA_PATH = 'json/track_keys_delta.json'
+SPOTIFY_INDEX_PATH = 'web/public/spotify-index.json'
+NOT_FOUND_PATH = 'data/spotify-not-found.json'
+
+
+def track_key(track):
+    """Key a track the way spotify-index.json does"""
+    return f"{track['artist']}|{track['song']}"
+
+
+def iter_track_keys(playlists, table):
+    """
+    Pass date-sorted playlists through unchanged while filling table with
+    {key: {artist, song, count, first_aired, last_aired}}, in order of
+    first appearance.
+    """
+    for playlist in playlists:
+        date = playlist['date']
+        for track in playlist['tracks']:
+            key = track_key(track)
+            entry = table.get(key)
+            if entry is None:
+                table[key] = {'artist': track['artist'], 'song': track['song'], 'count': 1,
+                              'first_aired': date, 'last_aired': date}
+                continue
+            entry['count'] += 1
+            if date:
+                if not entry['first_aired'] or date < entry['first_aired']:
+                    entry['first_aired'] = date
+                if not entry['last_aired'] or date > entry['last_aired']:
+                    entry['last_aired'] = date
+        yield playlist
+
+
+def _load_keys(path, field):
+    """Keys stored under field in a JSON file, or None if it doesn't exist yet"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)[field]
+    except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+        return None
+
+
+def _searched_keys(spotify_index_path, not_found_path):
+    """Keys the Spotify indexer has already searched: found ones plus known misses"""
+    keys = set()
+    try:
+        with open(spotify_index_path, 'r', encoding='utf-8') as f:
+            keys.update(json.load(f))
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    try:
+        with open(not_found_path, 'r', encoding='utf-8') as f:
+            keys.update(track_key(track) for track in json.load(f))
+    except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+        pass
+    return keys
+
+
+def write_track_keys(table, keys_path=TRACK_KEYS_PATH, delta_path=TRACK_DELTA_PATH,
+                     spotify_index_path=SPOTIFY_INDEX_PATH, not_found_path=NOT_FOUND_PATH):
+    """
+    Write the key table and update the delta: keys absent from the previous
+    table, plus keys from a delta not yet consumed that still exist. On the
+    first build the keys the Spotify indexer already searched (found or
+    not found) stand in for the previous table. Returns the number of keys
+    in the delta.
+    """
+    previous = _load_keys(keys_path, 'tracks')
+    pending = _load_keys(delta_path, 'tracks') or {}
+
+    if previous is None:
+        previous = _searched_keys(spotify_index_path, not_found_path)
+    new_keys = set(table) - set(previous)
+    delta_keys = new_keys | (set(pending) & set(table))
+
+    write_json_atomic({'track_count': len(table), 'tracks': table}, keys_path)
+    write_json_atomic({'track_count': len(delta_keys),
+                 'tracks': {key: entry for key, entry in table.items() if key in delta_keys}}, delta_path)
+    return len(delta_keys)
@@ -8,115 +8,161 @@ Reports issues like:
 - Tracks with missing artist/song
 - Duplicate dates
 - Malformed entries
+- Spelling variants of the same artist or track (written to json/variant_clusters.json)
 """
 
+import argparse
+import hashlib
 import json
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter, defaultdict
+
+from archive_index import ARCHIVE_INDEX_PATH, refresh_archive_index
+from json_io import write_json_atomic
+from near_duplicates import CLUSTERS_PATH, find_clusters, similar_tracks, track_form, write_clusters
+from playlist_manifest import MANIFEST_PATH, playlist_digest, bytes_digest, merkle_root, diff_digests, load_manifest
+
+
+# Per-file validation results, keyed by file content hash
+VALIDATION_CACHE_PATH = 'json/.validation_cache.json'
+
+
+def new_report():
+    """Empty validation report, filled in by check_playlist()"""
+    return {
+        'issues': [],
+        'warnings': [],
+        'stats': {
+            'total_playlists': 0,
+            'total_tracks': 0,
+            'empty_playlists': 0,
+            'tracks_missing_artist': 0,
+            'tracks_missing_song': 0,
+            'duplicate_dates': 0,
+            'playlists_missing_date': 0,
+            'playlists_missing_title': 0,
+            'artist_variant_clusters': 0,
+            'track_variant_clusters': 0
+        },
+        'dates_seen': defaultdict(list),
+        'artists': Counter(),
+        'tracks': Counter(),
+        'clusters': {'artists': [], 'tracks': []},
+    }
 
 
-def validate_playlists(json_dir='json/individual', consolidated_path='json/playlists.json'):
-    """Validate all playlist data and generate a report"""
+def playlist_label(playlist, index):
+    """Name used for a playlist in report messages"""
+    if playlist.get('date'):
+        return f"{playlist['date']}.json"
+    return f"playlist #{index}"
 
-    print("🔍 Validating Playlist Data")
-    print("=" * 70)
 
-    issues = []
-    warnings = []
-    stats = {
-        'total_playlists': 0,
-        'total_tracks': 0,
-        'empty_playlists': 0,
-        'tracks_missing_artist': 0,
-        'tracks_missing_song': 0,
-        'duplicate_dates': 0,
-        'playlists_missing_date': 0,
-        'playlists_missing_title': 0
-    }
+def check_playlist(playlist, label, report):
+    """Validate a single playlist dict, recording problems in the report"""
+    issues = report['issues']
+    warnings = report['warnings']
+    stats = report['stats']
 
-    json_path = Path(json_dir)
-    all_playlists = []
-    dates_seen = defaultdict(list)
+    stats['total_playlists'] += 1
 
-    # Load all individual playlist files
-    json_files = sorted(json_path.glob('*.json'))
+    # Validate date
+    if not playlist.get('date'):
+        stats['playlists_missing_date'] += 1
+        issues.append(f"⚠️  {label}: Missing date")
+    else:
+        report['dates_seen'][playlist['date']].append(label)
 
-    if not json_files:
-        issues.append(f"❌ ERROR: No JSON files found in {json_dir}")
-        return issues, warnings, stats
+    # Validate title
+    if not playlist.get('title'):
+        stats['playlists_missing_title'] += 1
+        warnings.append(f"⚠️  {label}: Missing title")
 
-    print(f"\nValidating {len(json_files)} playlist files...\n")
+    # Validate tracks
+    tracks = playlist.get('tracks', [])
+    stats['total_tracks'] += len(tracks)
 
-    for json_file in json_files:
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                playlist = json.load(f)
+    if len(tracks) == 0:
+        stats['empty_playlists'] += 1
+        issues.append(f"❌ {label}: Empty playlist (0 tracks)")
 
-            all_playlists.append(playlist)
-            stats['total_playlists'] += 1
+    # Validate each track
+    for i, track in enumerate(tracks, 1):
+        if not isinstance(track, dict):
+            issues.append(f"❌ {label}: Track #{i} is not a valid object")
+            continue
 
-            # Validate date
-            if not playlist.get('date'):
-                stats['playlists_missing_date'] += 1
-                issues.append(f"⚠️  {json_file.name}: Missing date")
-            else:
-                dates_seen[playlist['date']].append(json_file.name)
+        if not track.get('artist'):
+            stats['tracks_missing_artist'] += 1
+            warnings.append(f"⚠️  {label}: Track #{i} missing artist")
 
-            # Validate title
-            if not playlist.get('title'):
-                stats['playlists_missing_title'] += 1
-                warnings.append(f"⚠️  {json_file.name}: Missing title")
+        if not track.get('song'):
+            stats['tracks_missing_song'] += 1
+            warnings.append(f"⚠️  {label}: Track #{i} missing song")
 
-            # Validate tracks
-            tracks = playlist.get('tracks', [])
-            stats['total_tracks'] += len(tracks)
+        if track.get('artist'):
+            report['artists'][track['artist']] += 1
+            if track.get('song'):
+                report['tracks'][f"{track['artist']}|{track['song']}"] += 1
 
-            if len(tracks) == 0:
-                stats['empty_playlists'] += 1
-                issues.append(f"❌ {json_file.name}: Empty playlist (0 tracks)")
 
-            # Validate each track
-            for i, track in enumerate(tracks, 1):
-                if not isinstance(track, dict):
-                    issues.append(f"❌ {json_file.name}: Track #{i} is not a valid object")
-                    continue
+def iter_validated(playlists, report):
+    """Validate playlists as they stream past, yielding each one unchanged"""
+    for index, playlist in enumerate(playlists, 1):
+        check_playlist(playlist, playlist_label(playlist, index), report)
+        yield playlist
 
-                if not track.get('artist'):
-                    stats['tracks_missing_artist'] += 1
-                    warnings.append(f"⚠️  {json_file.name}: Track #{i} missing artist")
 
-                if not track.get('song'):
-                    stats['tracks_missing_song'] += 1
-                    warnings.append(f"⚠️  {json_file.name}: Track #{i} missing song")
+def _variant_warning(kind, cluster):
+    variants = ', '.join(f"'{name}' ({count})" for name, count in cluster['variants'].items())
+    return f"⚠️  {kind} spelling variants ({cluster['match']}): {variants}"
 
-        except json.JSONDecodeError as e:
-            issues.append(f"❌ {json_file.name}: Invalid JSON - {e}")
-        except Exception as e:
-            issues.append(f"❌ {json_file.name}: Error reading file - {e}")
 
+def finish_report(report, consolidated_count=None):
+    """Run the cross-playlist checks once every playlist has been checked"""
     # Check for duplicate dates
-    for date, files in dates_seen.items():
+    for date, files in report['dates_seen'].items():
         if len(files) > 1:
-            stats['duplicate_dates'] += 1
-            issues.append(f"❌ Duplicate date {date}: {', '.join(files)}")
-
-    # Validate consolidated file exists and matches
-    if Path(consolidated_path).exists():
-        try:
-            with open(consolidated_path, 'r', encoding='utf-8') as f:
-                consolidated = json.load(f)
-
-            if len(consolidated) != len(all_playlists):
-                issues.append(
-                    f"❌ Consolidated file mismatch: "
-                    f"Has {len(consolidated)} playlists but found {len(all_playlists)} individual files"
-                )
-        except Exception as e:
-            issues.append(f"❌ Error reading consolidated file: {e}")
-    else:
-        warnings.append(f"⚠️  Consolidated file not found: {consolidated_path}")
+            report['stats']['duplicate_dates'] += 1
+            report['issues'].append(f"❌ Duplicate date {date}: {', '.join(files)}")
+
+    # Validate consolidated file matches
+    if consolidated_count is not None and consolidated_count != report['stats']['total_playlists']:
+        report['issues'].append(
+            f"❌ Consolidated file mismatch: "
+            f"Has {consolidated_count} playlists but found {report['stats']['total_playlists']} individual files"
+        )
+
+    # Group spelling variants of the same artist / track
+    clusters = {
+        'artists': find_clusters(report['artists']),
+        'tracks': find_clusters(report['tracks'], track_form, similar_tracks),
+    }
+    report['clusters'] = clusters
+    report['stats']['artist_variant_clusters'] = len(clusters['artists'])
+    report['stats']['track_variant_clusters'] = len(clusters['tracks'])
+    report['warnings'].extend(_variant_warning('Artist', c) for c in clusters['artists'])
+    report['warnings'].extend(_variant_warning('Track', c) for c in clusters['tracks'])
+
+
+def validate_playlist_data(playlists, consolidated_count=None):
+    """
+    Validate an iterable of playlist dicts without touching the disk.
+    Returns the finished report; pass it to print_report() for output.
+    """
+    report = new_report()
+    for _ in iter_validated(playlists, report):
+        pass
+    finish_report(report, consolidated_count)
+    return report
+
+
+def print_report(report):
+    """Print the validation report, returning True if validation passed"""
+    issues = report['issues']
+    warnings = report['warnings']
+    stats = report['stats']
 
-    # Print report
     print("\n" + "=" * 70)
     print("📊 Validation Report")
     print("=" * 70)
@@ -157,6 +203,10 @@ def validate_playlists(json_dir='json/individual', consolidated_path='json/playl
         print(f"⚠️  Tracks missing song: {stats['tracks_missing_song']}")
     if stats['duplicate_dates'] > 0:
         print(f"⚠️  Duplicate dates: {stats['duplicate_dates']}")
+    if stats['artist_variant_clusters'] > 0:
+        print(f"⚠️  Artists with spelling variants: {stats['artist_variant_clusters']}")
+    if stats['track_variant_clusters'] > 0:
+        print(f"⚠️  Tracks with spelling variants: {stats['track_variant_clusters']}")
 
     print("\n" + "=" * 70)
 
@@ -169,5 +219,235 @@ def validate_playlists(json_dir='json/individual', consolidated_path='json/playl
         return True
 
 
+def validator_fingerprint():
+    """Hash of this validator's source, so any rule change invalidates the cache"""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+
+
+def load_validation_cache(cache_path):
+    """Load cached per-file results, discarding them if the validator has changed"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+    if cache.get('validator_version') != validator_fingerprint():
+        return {}
+    return cache
+
+
+def save_validation_cache(cache_path, files, consolidated):
+    """Atomically write the validation cache"""
+    write_json_atomic({'validator_version': validator_fingerprint(), 'files': files, 'consolidated': consolidated},
+                      cache_path, compact=True)
+
+
+def read_if_changed(path, cached):
+    """
+    Return (content, cache entry) for path. content is None when the file
+    is unchanged since `cached` was recorded, so it need not be decoded again.
+    """
+    stat = path.stat()
+    entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+        entry['sha256'] = cached['sha256']
+        return None, entry
+
+    content = path.read_bytes()
+    entry['sha256'] = hashlib.sha256(content).hexdigest()
+    if cached and cached['sha256'] == entry['sha256']:
+        return None, entry
+    return content, entry
+
+
+def check_file(content, label):
+    """Validate one playlist file's raw content, returning a cacheable summary"""
+    report = new_report()
+    date = None
+    try:
+        playlist = json.loads(content.decode('utf-8'))
+        check_playlist(playlist, label, report)
+        date = playlist.get('date')
+    except json.JSONDecodeError as e:
+        report['issues'].append(f"❌ {label}: Invalid JSON - {e}")
+    except Exception as e:
+        report['issues'].append(f"❌ {label}: Error reading file - {e}")
+
+    return {'issues': report['issues'], 'warnings': report['warnings'],
+            'stats': report['stats'], 'date': date,
+            'artists': report['artists'], 'tracks': report['tracks']}
+
+
+def merge_file_summary(report, summary, label):
+    """Fold a per-file summary into the overall report"""
+    report['issues'].extend(summary['issues'])
+    report['warnings'].extend(summary['warnings'])
+    for key, value in summary['stats'].items():
+        report['stats'][key] += value
+    if summary['date']:
+        report['dates_seen'][summary['date']].append(label)
+    report['artists'].update(summary['artists'])
+    report['tracks'].update(summary['tracks'])
+
+
+def _format_dates(dates, limit=10):
+    shown = ', '.join(dates[:limit])
+    return shown + (f" ... and {len(dates) - limit} more" if len(dates) > limit else '')
+
+
+def check_manifest(report, manifest, individual_digests, copies):
+    """
+    Compare the individual files and consolidated copies against the digest manifest.
+    individual_digests maps date -> playlist digest; copies is a list of
+    (manifest file name, path, byte sha256) for consolidated files on disk.
+    Per-date comparisons only happen when a root or byte digest disagrees.
+    """
+    issues = report['issues']
+    manifest_digests = manifest.get('playlists', {})
+
+    if manifest.get('root_digest') != merkle_root(manifest_digests):
+        issues.append("❌ Manifest is corrupt: root digest does not match its playlist digests")
+        return
+
+    if merkle_root(individual_digests) != manifest['root_digest']:
+        dates = diff_digests(manifest_digests, individual_digests)
+        issues.append(f"❌ Individual files differ from manifest for {len(dates)} dates: {_format_dates(dates)}")
+
+    for name, path, sha256 in copies:
+        expected = manifest.get('files', {}).get(name)
+        if expected is None or sha256 == expected['sha256']:
+            continue
+
+        # Bytes differ: decode to find out which playlists changed
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                actual = {p['date']: playlist_digest(p) for p in json.load(f) if p.get('date')}
+        except Exception as e:
+            issues.append(f"❌ Error reading {path}: {e}")
+            continue
+
+        dates = diff_digests(manifest_digests, actual)
+        if dates:
+            issues.append(f"❌ {path} differs from manifest for {len(dates)} dates: {_format_dates(dates)}")
+        else:
+            report['warnings'].append(f"⚠️  {path}: Formatting differs from manifest but all playlists match")
+
+
+def validate_playlists(json_dir='json/individual', consolidated_path='json/playlists.json',
+                       cache_path=VALIDATION_CACHE_PATH, manifest_path=MANIFEST_PATH,
+                       web_path='web/public/playlists.json', index_path=ARCHIVE_INDEX_PATH,
+                       clusters_path=CLUSTERS_PATH):
+    """
+    Standalone audit: re-read all playlist data from disk and generate a report.
+    The parser validates freshly parsed data in-process with --validate instead.
+    Per-file results are cached by content hash, so only changed files are
+    re-checked; the cross-file checks are rebuilt from the cached summaries.
+    Pass cache_path=None to re-check everything.
+    If the parser's digest manifest exists, the individual files (by way of
+    the archive date index), the consolidated file and the web copy are
+    checked against it.
+    Spelling-variant clusters are written to clusters_path unless it is None.
+    """
+
+    print("🔍 Validating Playlist Data")
+    print("=" * 70)
+
+    report = new_report()
+    json_path = Path(json_dir)
+
+    # Load all individual playlist files
+    json_files = sorted(json_path.glob('*.json'))
+
+    if not json_files:
+        report['issues'].append(f"❌ ERROR: No JSON files found in {json_dir}")
+        return print_report(report)
+
+    print(f"\nValidating {len(json_files)} playlist files...\n")
+
+    cache = load_validation_cache(cache_path) if cache_path else {}
+    cached_files = cache.get('files', {})
+    new_files = {}
+    rechecked = 0
+
+    for json_file in json_files:
+        cached = cached_files.get(json_file.name)
+        try:
+            content, entry = read_if_changed(json_file, cached)
+        except Exception as e:
+            report['issues'].append(f"❌ {json_file.name}: Error reading file - {e}")
+            continue
+
+        if content is None:
+            entry['summary'] = cached['summary']
+        else:
+            entry['summary'] = check_file(content, json_file.name)
+            rechecked += 1
+
+        merge_file_summary(report, entry['summary'], json_file.name)
+        new_files[json_file.name] = entry
+
+    if cache_path:
+        print(f"Re-checked {rechecked} changed files, reused {len(new_files) - rechecked} cached results")
+
+    # Validate consolidated file exists and matches
+    consolidated_count = None
+    consolidated_entry = None
+    if Path(consolidated_path).exists():
+        cached = cache.get('consolidated')
+        try:
+            content, consolidated_entry = read_if_changed(Path(consolidated_path), cached)
+            if content is None:
+                consolidated_entry['count'] = cached['count']
+            else:
+                consolidated_entry['count'] = len(json.loads(content.decode('utf-8')))
+            consolidated_count = consolidated_entry['count']
+        except Exception as e:
+            consolidated_entry = None
+            report['issues'].append(f"❌ Error reading consolidated file: {e}")
+    else:
+        report['warnings'].append(f"⚠️  Consolidated file not found: {consolidated_path}")
+
+    if cache_path:
+        save_validation_cache(cache_path, new_files, consolidated_entry)
+
+    # Check every copy of the data against the parser's digest manifest
+    manifest = load_manifest(manifest_path) if manifest_path else None
+    if manifest:
+        individual_digests = {date: entry['digest']
+                              for date, entry in refresh_archive_index(json_dir, index_path).items()}
+        copies = []
+        if consolidated_entry:
+            copies.append(('consolidated', consolidated_path, consolidated_entry['sha256']))
+        if web_path and Path(web_path).exists():
+            copies.append(('web', web_path, bytes_digest(web_path)))
+        check_manifest(report, manifest, individual_digests, copies)
+    elif manifest_path:
+        report['warnings'].append(f"⚠️  Digest manifest not found: {manifest_path}")
+
+    finish_report(report, consolidated_count)
+    if clusters_path:
+        write_clusters(report['clusters']['artists'], report['clusters']['tracks'], clusters_path)
+    return print_report(report)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate parsed playlist data on disk')
+    parser.add_argument('--json-dir', default='json/individual', help='Directory of individual playlist JSON files')
+    parser.add_argument('--consolidated', default='json/playlists.json', help='Consolidated playlists file')
+    parser.add_argument('--web', default='web/public/playlists.json', help='Web app copy of the consolidated file')
+    parser.add_argument('--manifest', default=MANIFEST_PATH, help=f'Digest manifest (default: {MANIFEST_PATH})')
+    parser.add_argument('--clusters', default=CLUSTERS_PATH,
+                        help=f'Where to write spelling-variant clusters (default: {CLUSTERS_PATH})')
+    parser.add_argument('--no-cache', action='store_true', help='Re-check every file, ignoring the validation cache')
+    parser.add_argument('--cache', default=VALIDATION_CACHE_PATH,
+                        help=f'Validation cache location (default: {VALIDATION_CACHE_PATH})')
+    args = parser.parse_args()
+
+    validate_playlists(args.json_dir, args.consolidated,
+                       cache_path=None if args.no_cache else args.cache,
+                       manifest_path=args.manifest, web_path=args.web, clusters_path=args.clusters)
+
+
 if __name__ == '__main__':
-    validate_playlists()
+    main()
@@ -237,35 +237,55 @@ function calculateConfidence(originalArtist, originalSong, spotifyTrack) {
 
 // Step 4: Index all unique tracks
 async function indexAllTracks() {
-  const missingOnly = process.argv.includes('--missing-only')
+  const deltaOnly = process.argv.includes('--delta')
+  // The delta only lists new keys, so everything already indexed is kept
+  const missingOnly = deltaOnly || process.argv.includes('--missing-only')
+  const deltaPath = 'json/track_keys_delta.json'
 
   console.log('📀 Cyprus Avenue Spotify Track Indexer')
-  if (missingOnly) {
+  if (deltaOnly) {
+    console.log('🔍 Mode: Indexing only tracks new since the last run (track key delta)')
+  } else if (missingOnly) {
     console.log('🔍 Mode: Indexing only missing tracks')
   }
   console.log('=====================================\n')
 
-  // Read playlists
-  const playlistsPath = 'json/playlists.json'
-  if (!fs.existsSync(playlistsPath)) {
-    console.error(`❌ Error: ${playlistsPath} not found`)
-    process.exit(1)
-  }
-
-  const playlists = JSON.parse(fs.readFileSync(playlistsPath, 'utf-8'))
-
   // Get unique tracks
   const uniqueTracks = new Map()
-  for (const playlist of playlists) {
-    for (const track of playlist.tracks) {
-      const key = `${track.artist}|${track.song}`
-      if (!uniqueTracks.has(key)) {
-        uniqueTracks.set(key, track)
+  let deltaTracks = {}
+
+  if (deltaOnly) {
+    // Read the new track keys written by the parser
+    if (!fs.existsSync(deltaPath)) {
+      console.error(`❌ Error: ${deltaPath} not found. Run ./update-playlists.sh first`)
+      process.exit(1)
+    }
+
+    deltaTracks = JSON.parse(fs.readFileSync(deltaPath, 'utf-8')).tracks
+    for (const [key, entry] of Object.entries(deltaTracks)) {
+      uniqueTracks.set(key, { artist: entry.artist, song: entry.song })
+    }
+  } else {
+    // Read playlists
+    const playlistsPath = 'json/playlists.json'
+    if (!fs.existsSync(playlistsPath)) {
+      console.error(`❌ Error: ${playlistsPath} not found`)
+      process.exit(1)
+    }
+
+    const playlists = JSON.parse(fs.readFileSync(playlistsPath, 'utf-8'))
+
+    for (const playlist of playlists) {
+      for (const track of playlist.tracks) {
+        const key = `${track.artist}|${track.song}`
+        if (!uniqueTracks.has(key)) {
+          uniqueTracks.set(key, track)
+        }
       }
     }
   }
 
-  console.log(`Found ${uniqueTracks.size} unique tracks total\n`)
+  console.log(`Found ${uniqueTracks.size} unique tracks ${deltaOnly ? 'in delta' : 'total'}\n`)
 
   // Get Spotify token
   const token = await getSpotifyToken()
@@ -302,6 +322,7 @@ async function indexAllTracks() {
   }
 
   const notFoundTracks = []
+  const erroredKeys = new Set()
   const stats = {
     total: uniqueTracks.size,
     found: 0,
@@ -361,6 +382,7 @@ async function indexAllTracks() {
       }
     } catch (error) {
       console.log(` ⚠ (error: ${error.message})`)
+      erroredKeys.add(key)
       stats.notFound++
       notFoundTracks.push({
         artist: track.artist,
@@ -382,8 +404,23 @@ async function indexAllTracks() {
   // Save not-found tracks
   const notFoundPath = 'data/spotify-not-found.json'
   fs.mkdirSync('data', { recursive: true })
+  if (deltaOnly && fs.existsSync(notFoundPath)) {
+    // The delta only covers new keys: keep the known misses from earlier runs,
+    // replacing the entries for keys searched again this time
+    const searched = new Set(tracksToProcess.map(item => item.key))
+    const known = JSON.parse(fs.readFileSync(notFoundPath, 'utf-8'))
+      .filter(track => !searched.has(`${track.artist}|${track.song}`))
+    notFoundTracks.unshift(...known)
+  }
   fs.writeFileSync(notFoundPath, JSON.stringify(notFoundTracks, null, 2))
 
+  // The delta has been searched; keys whose lookup failed stay in it to be retried,
+  // and the parser adds keys to it again as new tracks appear
+  if (deltaOnly) {
+    const retry = Object.fromEntries(Object.entries(deltaTracks).filter(([key]) => erroredKeys.has(key)))
+    fs.writeFileSync(deltaPath, JSON.stringify({ track_count: erroredKeys.size, tracks: retry }, null, 2))
+  }
+
   // Print summary
   console.log('\n=====================================')
   console.log('✨ Indexing Complete!')
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Resolve tracks in data/spotify-not-found.json against the existing Spotify index.
+
+Many "not found" tracks are spelling variants of tracks already in
+web/public/spotify-index.json: curly quotes, punctuation, case, "&" vs
+"and". This matches them locally, without any API calls. Index entries are
+normalized and blocked on character trigrams, so each not-found track is
+only compared with the few entries sharing the most trigrams with it.
+High-confidence matches are written back to the index under the
+not-found track's key and removed from the not-found list.
+
+Usage:
+    python scripts/spotify/resolve_not_found.py [--dry-run] [--threshold 0.95]
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from pathlib import Path
+
+# Name normalization and JSON writing are shared with the parsing pipeline's near-duplicate report
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'parsing'))
+from json_io import write_json_atomic
+from near_duplicates import normalize_name
+
+
+INDEX_PATH = 'web/public/spotify-index.json'
+NOT_FOUND_PATH = 'data/spotify-not-found.json'
+
+# Trigrams shared by more entries than this carry no signal for blocking
+MAX_POSTINGS = 200
+# Candidates scored in full per not-found track
+MAX_CANDIDATES = 10
+
+def normalize(text):
+    """Lowercase ASCII form with quotes, punctuation, brackets, '&' and a leading 'the' ironed out"""
+    return normalize_name(text, drop_brackets=True)
+
+
+def compact(norm_artist, norm_song):
+    """Exact-match key that also ignores word breaks ("Water Boy" vs "Waterboy")"""
+    return norm_artist.replace(' ', ''), norm_song.replace(' ', '')
+
+
+def trigrams(text):
+    """Character trigrams of a padded string"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a, b):
+    """Similarity ratio of two normalized strings, 1.0 for an exact match"""
+    if a == b:
+        return 1.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+class IndexMatcher:
+    """Normalized exact lookup plus trigram-blocked fuzzy lookup over index keys"""
+
+    def __init__(self, track_index):
+        self.entries = []
+        self.exact = {}
+        self.postings = defaultdict(list)
+
+        for key, value in track_index.items():
+            artist, _, song = key.partition('|')
+            names = {(artist, song)}
+            if value.get('artistName') and value.get('trackName'):
+                names.add((value['artistName'], value['trackName']))
+
+            for artist_name, song_name in names:
+                norm_artist, norm_song = normalize(artist_name), normalize(song_name)
+                entry_id = len(self.entries)
+                self.entries.append((key, norm_artist, norm_song))
+                self.exact.setdefault(compact(norm_artist, norm_song), key)
+                for gram in trigrams(f"{norm_artist}|{norm_song}"):
+                    self.postings[gram].append(entry_id)
+
+    def match(self, artist, song):
+        """(index key, artist score, song score) of the best match, or None"""
+        norm_artist, norm_song = normalize(artist), normalize(song)
+        key = self.exact.get(compact(norm_artist, norm_song))
+        if key:
+            return key, 1.0, 1.0
+
+        shared = Counter()
+        for gram in trigrams(f"{norm_artist}|{norm_song}"):
+            posting = self.postings.get(gram)
+            if posting and len(posting) <= MAX_POSTINGS:
+                shared.update(posting)
+
+        best = None
+        for entry_id, _ in shared.most_common(MAX_CANDIDATES):
+            key, cand_artist, cand_song = self.entries[entry_id]
+            artist_score = similarity(norm_artist, cand_artist)
+            song_score = similarity(norm_song, cand_song)
+            if best is None or min(artist_score, song_score) > min(best[1], best[2]):
+                best = (key, artist_score, song_score)
+        return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Match not-found tracks to the existing Spotify index offline')
+    parser.add_argument('--index', default=INDEX_PATH, help=f'Spotify index (default: {INDEX_PATH})')
+    parser.add_argument('--not-found', default=NOT_FOUND_PATH, help=f'Not-found tracks (default: {NOT_FOUND_PATH})')
+    parser.add_argument('--threshold', type=float, default=0.95,
+                        help='Minimum artist and song similarity to accept a match (default: 0.95)')
+    parser.add_argument('--dry-run', action='store_true', help='Show matches without writing anything')
+    args = parser.parse_args()
+
+    print("🔗 Resolving Spotify not-found tracks offline")
+    print("=" * 60)
+
+    with open(args.index, 'r', encoding='utf-8') as f:
+        track_index = json.load(f)
+    with open(args.not_found, 'r', encoding='utf-8') as f:
+        not_found = json.load(f)
+
+    matcher = IndexMatcher(track_index)
+    print(f"Indexed {len(track_index)} Spotify tracks ({len(matcher.postings)} trigrams)")
+    print(f"Matching {len(not_found)} not-found tracks...\n")
+
+    resolved = 0
+    still_missing = []
+
+    for track in not_found:
+        key = f"{track['artist']}|{track['song']}"
+        if key in track_index:
+            resolved += 1  # Indexed since the not-found list was written
+            continue
+
+        match = matcher.match(track['artist'], track['song'])
+        if match is None or min(match[1], match[2]) < args.threshold:
+            still_missing.append(track)
+            continue
+
+        matched_key, artist_score, song_score = match
+        print(f"  ✓ {key}  →  {matched_key}  ({artist_score:.2f}/{song_score:.2f})")
+        track_index[key] = dict(track_index[matched_key], resolvedFrom=matched_key)
+        resolved += 1
+
+    print(f"\nResolved {resolved} of {len(not_found)} tracks without API calls")
+    print(f"Still not found: {len(still_missing)}")
+
+    if args.dry_run:
+        print("\n(dry run, nothing written)")
+    elif resolved:
+        write_json_atomic(track_index, args.index)
+        write_json_atomic(still_missing, args.not_found)
+        print(f"\n✓ Updated {args.index} and {args.not_found}")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,14 +6,16 @@
 # This is fast (< 1 second) and safe to run frequently.
 #
 # Usage:
-#   ./update-playlists.sh
+#   ./update-playlists.sh              # Incremental parse (only changed files)
+#   ./update-playlists.sh --jobs 4     # Parse changed files across 4 processes
+#   ./update-playlists.sh --no-cache   # Force a full re-parse
 #
 # What it does:
 #   1. Parses archive/txt/*.txt files
 #   2. Generates json/individual/*.json files
 #   3. Generates json/playlists.json
 #   4. Copies to web/public/playlists.json
-#   5. Runs validation and shows quality report
+#   5. Validates each playlist as it is parsed and shows quality report
 #
 
 set -e  # Exit on error
@@ -37,7 +39,7 @@ docker build -f docker/Dockerfile.parse -t cyprus-avenue-parser . -q
 PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
 echo ""
-echo "📝 Parsing playlist files..."
+echo "📝 Parsing and validating playlist files..."
 echo ""
 
 # Run parser with mounted volumes
@@ -45,19 +47,9 @@ docker run --rm \
     -v "$PROJECT_ROOT/archive/txt:/app/txt" \
     -v "$PROJECT_ROOT/json:/app/json" \
     -v "$PROJECT_ROOT/web/public:/app/web/public" \
-    cyprus-avenue-parser
-
-echo ""
-echo "✅ Parsing complete!"
-echo ""
-echo "🔍 Running validation..."
-echo ""
-
-# Run validation
-docker run --rm \
-    -v "$PROJECT_ROOT/json:/app/json" \
+    -v "$PROJECT_ROOT/data:/app/data:ro" \
     cyprus-avenue-parser \
-    python validate_playlists.py
+    python parse_playlists.py --validate "$@"
 
 echo ""
 echo "✨ Update complete! Your playlist data is ready."
@@ -1,5 +1,7 @@
 export interface Track {
   artist: string
+  artist_id?: string  // Shared by spelling variants of the same artist
+  canonical_artist?: string  // Corrected name, when data/artist_aliases.json has one
   song: string
   genres?: string[]
 }